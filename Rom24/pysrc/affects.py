@@ -86,8 +86,8 @@ class Affects:
         return self.affected_by.is_set(aff)
 
     def affect_add(self, paf):
-        paf_new = handler_game.AFFECT_DATA()
-        paf_new.__dict__ = paf.__dict__.copy()
+        paf_new = paf.copy()
+        paf_new.start_timing(self)
         self.affected.append(paf_new)
         self.affect_modify(paf_new, True)
         return
@@ -118,6 +118,7 @@ class Affects:
             logger.error("Affect_remove: cannot find paf.")
             return
         self.affected.remove(paf)
+        paf.stop_timing()
         del paf
         self.affect_check(where, vector)
         return
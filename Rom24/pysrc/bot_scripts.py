@@ -0,0 +1,44 @@
+"""
+Scripted player behaviour shared by the load tester and the simulator.
+
+Kept apart from loadtest so the simulator can use the scripts without
+pulling in asyncio.
+"""
+import random
+import string
+
+# Weighted command scripts.  {dir}, {target} and {text} are filled in at
+# random each time a command is chosen.
+SCRIPTS = {
+    'explorer': [(6, '{dir}'), (3, 'look'), (1, 'exits'), (1, 'scan'), (1, 'score')],
+    'chatter': [(4, 'say {text}'), (2, 'look'), (1, '{dir}'), (1, 'who'), (1, 'emote {text}')],
+    'fighter': [(3, '{dir}'), (3, 'kill {target}'), (2, "cast 'magic missile' {target}"),
+                (1, "cast 'armor'"), (1, 'look'), (1, 'flee')],
+}
+SCRIPTS['mixed'] = SCRIPTS['explorer'] + SCRIPTS['chatter'] + SCRIPTS['fighter']
+
+DIRECTIONS = ['north', 'east', 'south', 'west', 'up', 'down']
+TARGETS = ['rat', 'dog', 'cat', 'beggar', 'monster', 'fido', 'snake', 'bird']
+SAYINGS = ['hello', 'anyone around?', 'which way to the temple?', 'nice weather', 'brb']
+
+
+def scripted_command(script):
+    """Pick a command from a weighted script and fill in its blanks."""
+    pick = random.uniform(0, sum(weight for weight, template in script))
+    for weight, template in script:
+        pick -= weight
+        if pick <= 0:
+            break
+    return template.format(dir=random.choice(DIRECTIONS), target=random.choice(TARGETS),
+                           text=random.choice(SAYINGS))
+
+
+def bot_name(prefix, number):
+    # Player names have to be letters only.
+    suffix = ''
+    while True:
+        number, digit = divmod(number, 26)
+        suffix = string.ascii_lowercase[digit] + suffix
+        if not number:
+            break
+    return (prefix + suffix.rjust(3, 'a')).title()[:12]
@@ -44,6 +44,7 @@ import game_utils
 import handler_game
 import merc
 import nanny
+import settings
 import handler_ch
 import state_checks
 import instance
@@ -53,12 +54,47 @@ done = False
 
 def process_input():
     for d in merc.descriptor_list:
-        if d.active and d.cmd_ready and d.connected:
-            d.connected()
-            if d.is_connected(nanny.con_playing):
-                ch = handler_ch.CH(d)
-                if ch:
-                    ch.timer = 0
+        process_descriptor_input(d)
+
+
+def process_descriptor_input(d):
+    if d.active and d.cmd_ready and d.connected:
+        if d.dropped_commands > d.dropped_commands_told:
+            d.dropped_commands_told = d.dropped_commands
+            logger.warning("Input flood from %s, %d lines dropped", d.addrport(), d.dropped_commands)
+            d.send("\n*** PUT A LID ON IT!!! ***\n")
+        if not take_command_token(d):
+            return
+        d.connected()
+        if d.is_connected(nanny.con_playing):
+            ch = handler_ch.CH(d)
+            if ch:
+                ch.timer = 0
+
+
+def take_command_token(d):
+    """
+    Token bucket on commands: a descriptor earns COMMANDS_PER_PULSE tokens
+    a pulse, up to COMMAND_BURST, and spends one per command.  As in ROM, a
+    character in a wait state gets no commands until it wears off, so its
+    input stays queued.
+    """
+    if d.is_connected(nanny.con_playing) and d.character.wait > 0:
+        return False
+    now = time.time() * 1000
+    earned = (now - d.command_tokens_time) / merc.MILLISECONDS_PER_PULSE * settings.COMMANDS_PER_PULSE
+    d.command_tokens = min(settings.COMMAND_BURST, d.command_tokens + earned)
+    d.command_tokens_time = now
+    if d.command_tokens < 1:
+        return False
+    d.command_tokens -= 1
+    return True
+
+
+def process_async_input(d):
+    process_descriptor_input(d)
+    if d.active:
+        d.process_output()
 
 
 def set_connected(self, state):
@@ -70,8 +106,12 @@ def is_connected(self, state):
 
 
 def process_output(self):
+    """
+    Flush a descriptor once per pass of the game loop.  Everything sent to
+    it since the last flush goes out together, with a single prompt.
+    """
     ch = handler_ch.CH(self)
-    if ch and self.is_connected(nanny.con_playing) and self.send_buffer:
+    if ch and self.is_connected(nanny.con_playing) and self.new_output:
         #/* battle prompt */
         if ch.fighting:
             victim = ch.fighting
@@ -102,7 +142,15 @@ def process_output(self):
         if not ch.comm.is_set(merc.COMM_COMPACT):
             self.send("\n")
         bust_a_prompt(ch)
-    self.miniboa_send()
+    self.new_output = False
+    if self.send_pending:
+        self.socket_send()
+
+
+def flush_output():
+    for d in merc.descriptor_list[:]:
+        if d.active:
+            d.process_output()
 
 
 def init_descriptor(d):
@@ -116,12 +164,19 @@ def init_descriptor(d):
     d.original = None
     d.snoop_by = None
     d.close = d.deactivate
-    #Gain control over process output without messing with miniboa.
-    d.miniboa_send = d.socket_send
-    d.socket_send = MethodType(process_output, d)
+    d.process_output = MethodType(process_output, d)
+    d.send_high_water = settings.SEND_HIGH_WATER
+    d.send_hard_limit = settings.SEND_HARD_LIMIT
+    d.overflow_policy = settings.SEND_OVERFLOW_POLICY
+    d.spool_limit = settings.SEND_SPOOL_LIMIT
+    d.max_commands = settings.INPUT_QUEUE_LIMIT
+    d.dropped_commands_told = 0
+    d.command_tokens = settings.COMMAND_BURST
+    d.command_tokens_time = time.time() * 1000
     merc.descriptor_list.append(d)
     d.request_terminal_type()
     d.request_naws()
+    d.request_will_compress2()
 
 
 #Check if already playing.
@@ -276,3 +331,4 @@ def game_loop(server):
         server.poll()
         process_input()
         update_handler()
+        flush_output()
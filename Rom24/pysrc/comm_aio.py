@@ -0,0 +1,77 @@
+"""
+/***************************************************************************
+ *  Original Diku Mud copyright (C) 1990, 1991 by Sebastian Hammer,        *
+ *  Michael Seifert, Hans Henrik St{rfeldt, Tom Madsen, and Katja Nyboe.   *
+ *                                                                         *
+ *  Merc Diku Mud improvments copyright (C) 1992, 1993 by Michael          *
+ *  Chastain, Michael Quan, and Mitchell Tse.                              *
+ *                                                                         *
+ *  In order to use any part of this Merc Diku Mud, you must comply with   *
+ *  both the original Diku license in 'license.doc' as well the Merc       *
+ *  license in 'license.txt'.  In particular, you may not remove either of *
+ *  these copyright notices.                                               *
+ *                                                                         *
+ *  Much time and thought has gone into this software and you are          *
+ *  benefitting.  We hope that you share your changes too.  What goes      *
+ *  around, comes around.                                                  *
+ ***************************************************************************/
+
+/***************************************************************************
+*   ROM 2.4 is copyright 1993-1998 Russ Taylor                             *
+*   ROM has been brought to you by the ROM consortium                      *
+*       Russ Taylor (rtaylor@hypercube.org)                                *
+*       Gabrielle Taylor (gtaylor@hypercube.org)                           *
+*       Brian Moore (zump@rom.org)                                         *
+*   By using this code, you have agreed to follow the terms of the         *
+*   ROM license, in the file Rom24/doc/rom.license                         *
+***************************************************************************/
+/************
+ * Ported to Python by Davion of MudBytes.net
+ * Using Miniboa https://code.google.com/p/miniboa/
+ * Now using Python 3 version https://code.google.com/p/miniboa-py3/
+ ************/
+"""
+import asyncio
+import time
+import logging
+
+logger = logging.getLogger()
+
+import comm
+import db
+import instance
+import merc
+
+# The game loop for settings.ASYNC_SERVER, where miniboa.aio hands input to
+# the game as it arrives and the loop only has to run the pulses.  Kept out
+# of comm so that nothing imports asyncio unless the asyncio server is used.
+
+
+@asyncio.coroutine
+def pulse_loop():
+    import update
+
+    while not comm.done:
+        update.update_handler()
+        comm.flush_output()
+        next_pulse = update.previous_pulse + merc.MILLISECONDS_PER_PULSE
+        yield from asyncio.sleep(max(0, next_pulse - update.get_precise_time()) / 1000)
+
+
+@asyncio.coroutine
+def async_game_loop(server):
+    from pyom import startup_time
+
+    db.boot_db()
+
+    boot_time = time.time()
+    logger.boot('Pyom database booted in %.3f seconds', (boot_time - startup_time))
+    yield from server.start()
+    logger.boot("Pyom is ready to rock on port %d (asyncio)", server.port)
+    instance.save()
+
+    comm.done = False
+    try:
+        yield from pulse_loop()
+    finally:
+        server.stop()
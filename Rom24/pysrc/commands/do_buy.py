@@ -5,6 +5,7 @@ logger = logging.getLogger()
 
 import merc
 import game_utils
+import name_index
 import handler_game
 import handler_room
 import interp
@@ -68,7 +69,7 @@ def do_buy(ch, argument):
 
         argument, arg = merc.read_word(argument)
         if arg:
-            pet.name = "%s %s" % (pet.name, arg)
+            name_index.rename(pet, "%s %s" % (pet.name, arg))
         pet.description = "%sA neck tag says 'I belong to %s'.\n" % (pet.description, ch.name)
         pet.put(ch.in_room)
         merc.add_follower(pet, ch)
@@ -32,7 +32,7 @@ def do_grats(ch, argument):
                     and d.character != ch \
                     and not victim.comm.is_set(merc.COMM_NOGRATS)\
                     and not victim.comm.is_set(merc.COMM_QUIET):
-                handler_game.act("$n grats '$t'", ch, argument, d.character, merc.TO_VICT, merc.POS_SLEEPING)
+                handler_game.act("$n grats '$t'", ch, argument, d.character, merc.TO_VICT, merc.POS_SLEEPING, droppable=True)
 
 
 interp.register_command(interp.cmd_type('grats', do_grats, merc.POS_SLEEPING, 0, merc.LOG_NORMAL, 1))
@@ -24,7 +24,7 @@ def do_immtalk(ch, argument):
     for d in merc.descriptor_list:
         if d.is_connected(nanny.con_playing) and state_checks.IS_IMMORTAL(d.character) \
                 and not state_checks.IS_SET(d.character.comm, merc.COMM_NOWIZ):
-            handler_game.act("$n: $t", ch, argument, d.character, merc.TO_VICT, merc.POS_DEAD)
+            handler_game.act("$n: $t", ch, argument, d.character, merc.TO_VICT, merc.POS_DEAD, droppable=True)
 
 
 interp.register_command(interp.cmd_type('immtalk', do_immtalk, merc.POS_DEAD, merc.IM, merc.LOG_NORMAL, 1))
@@ -33,7 +33,7 @@ def do_music(ch, argument):
             if d.is_connected(nanny.con_playing) and d.character != ch \
                     and not victim.comm.is_set(merc.COMM_NOMUSIC) and not state_checks.IS_SET(victim.comm,
                                                                                                             merc.COMM_QUIET):
-                handler_game.act("$n MUSIC: '$t'", ch, argument, d.character, merc.TO_VICT, merc.POS_SLEEPING)
+                handler_game.act("$n MUSIC: '$t'", ch, argument, d.character, merc.TO_VICT, merc.POS_SLEEPING, droppable=True)
 
 
 interp.register_command(interp.cmd_type('music', do_music, merc.POS_SLEEPING, 0, merc.LOG_NORMAL, 1))
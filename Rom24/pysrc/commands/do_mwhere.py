@@ -28,8 +28,14 @@ def do_mwhere(ch, argument):
                     count, victim.name, victim.in_room.name, victim.in_room.vnum))
         return
     found = False
-    for victim in instance.characters.values():
-        if victim.in_room and argument in victim.name:
+    if argument.isdigit():
+        victim_ids = instance.instances_by_npc.get(int(argument), [])
+    else:
+        # Any part of the name, as mwhere always matched; the name index only knows word prefixes.
+        victim_ids = [victim_id for victim_id, victim in instance.characters.items() if argument in victim.name]
+    for victim_id in victim_ids:
+        victim = instance.characters[victim_id]
+        if victim.in_room:
             found = True
             count += 1
             ch.send("%3d) [[%5d]] %-28s [[%5d]] %s\n" % (
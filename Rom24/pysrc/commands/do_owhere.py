@@ -7,6 +7,7 @@ import interp
 import game_utils
 import state_checks
 import instance
+import name_index
 
 
 def do_owhere(ch, argument):
@@ -17,12 +18,18 @@ def do_owhere(ch, argument):
     if not argument:
         ch.send("Find what?\n")
         return
-    for item in instance.items.values():
-        if not ch.can_see_item(item) or not game_utils.is_name(argument, item.name) or ch.level < item.level:
+    if argument.isdigit():
+        item_ids = instance.instances_by_item.get(int(argument), [])
+    else:
+        item_ids = name_index.items.find(argument)
+    for item_id in item_ids:
+        item = instance.items[item_id]
+        if not ch.can_see_item(item) or ch.level < item.level \
+                or not (argument.isdigit() or game_utils.is_name(argument, item.name)):
             continue
         found = True
         number += 1
-        content = item.in_item
+        content = item
         while content.in_item:
             content = content.in_item
 
@@ -0,0 +1,29 @@
+import logging
+
+logger = logging.getLogger()
+
+import merc
+import interp
+import settings
+import update
+import instance
+
+
+def do_pulse(ch, argument):
+    lag = list(update.pulse_lag)
+    if lag:
+        ch.send("Pulse lag over the last %d updates: average %.1fms, worst %.1fms.\n" % (
+            len(lag), sum(lag) / len(lag), max(lag)))
+    ch.send("Catch up: %s past %d pulses; %d skipped, %d coalesced.\n" % (
+        settings.PULSE_CATCHUP_POLICY, settings.PULSE_CATCHUP_MAX,
+        update.pulses_skipped, update.pulses_coalesced))
+    hibernating = len([area for area in instance.areas.values() if area.hibernating])
+    ch.send("Areas: %d awake, %d hibernating.\n" % (len(instance.areas) - hibernating, hibernating))
+    ch.send("%-16s %8s %9s %9s %9s\n" % ("Phase", "Calls", "Average", "Recent", "Worst"))
+    for name, timing in update.phase_timing.items():
+        ch.send("%-16s %8d %7.2fms %7.2fms %7.2fms\n" % (
+            name, timing.calls, timing.average, timing.recent, timing.worst))
+    return
+
+
+interp.register_command(interp.cmd_type('pulse', do_pulse, merc.POS_DEAD, merc.L4, merc.LOG_NORMAL, 1))
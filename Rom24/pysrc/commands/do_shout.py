@@ -30,7 +30,7 @@ def do_shout(ch, argument):
         if d.is_connected(nanny.con_playing) and d.character != ch \
                 and not victim.comm.is_set(merc.COMM_SHOUTSOFF) and not state_checks.IS_SET(victim.comm,
                                                                                                           merc.COMM_QUIET):
-            handler_game.act("$n shouts '$t'", ch, argument, d.character, merc.TO_VICT)
+            handler_game.act("$n shouts '$t'", ch, argument, d.character, merc.TO_VICT, droppable=True)
 
 
 interp.register_command(interp.cmd_type('shout', do_shout, merc.POS_RESTING, 3, merc.LOG_NORMAL, 1))
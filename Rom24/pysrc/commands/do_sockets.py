@@ -14,9 +14,10 @@ def do_sockets(ch, argument):
                 and (not arg or arg not in d.character.name) \
                 or (d.original and game_utils.is_name(arg, d.original.name)):
             count += 1
-            ch.send("%s@%s\n" % (
+            ch.send("%s@%s  queue %dk spool %dk peak %dk dropped %d\n" % (
                 d.original.name if d.original else d.character.name if d.character else "(none)",
-                d.address))
+                d.address, d.send_buffer_size // 1024, d.spool_size // 1024,
+                d.send_queue_peak // 1024, d.dropped_messages))
     if count == 0:
         ch.send("No one by that name is connected.\n")
         return
@@ -5,6 +5,7 @@ logger = logging.getLogger()
 import merc
 import interp
 import game_utils
+import name_index
 import world_classes
 import state_checks
 import special
@@ -35,7 +36,7 @@ def do_string(ch, argument):
             if not victim.is_npc():
                 ch.send("Not on PC's.\n")
                 return
-            victim.name = arg3
+            name_index.rename(victim, arg3)
             return
         if "description".startswith(arg2):
             victim.description = arg3
@@ -70,7 +71,7 @@ def do_string(ch, argument):
             ch.send("Nothing like that in heaven or earth.\n")
             return
         if "name".startswith(arg2):
-            obj.name = arg3
+            name_index.rename(obj, arg3)
             return
         if "short".startswith(arg2):
             obj.short_descr = arg3
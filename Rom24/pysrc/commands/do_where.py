@@ -34,10 +34,9 @@ def do_where(ch, argument):
 
     else:
         found = False
-        for victim in instance.characters.values():
-            if victim.in_room \
-            and victim.in_room.area == ch.in_room.area \
-            and not victim.is_affected( merc.AFF_HIDE) \
+        for victim_id in sorted(ch.in_room.in_area.people):
+            victim = instance.characters[victim_id]
+            if not victim.is_affected( merc.AFF_HIDE) \
             and not victim.is_affected( merc.AFF_SNEAK) \
             and ch.can_see(victim) \
             and arg in victim.name.lower():
@@ -23,7 +23,7 @@ def do_yell(ch, argument):
                 and d.character.in_room is not None \
                 and d.character.in_room.area == ch.in_room.area \
                 and not state_checks.IS_SET(d.character.comm, merc.COMM_QUIET):
-            handler_game.act("$n yells '$t'", ch, argument, d.character, merc.TO_VICT)
+            handler_game.act("$n yells '$t'", ch, argument, d.character, merc.TO_VICT, droppable=True)
 
 
 interp.register_command(interp.cmd_type('yell', do_yell, merc.POS_RESTING, 0, merc.LOG_NORMAL, 1))
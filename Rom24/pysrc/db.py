@@ -131,6 +131,8 @@ def fix_exits():
 def area_update():
     for area_id, area in instance.areas.items():
         area.age += 1
+        if area.hibernating:
+            continue  # Reset when it wakes, see update.catch_up_area
         if area.age < 3:
             continue
         #
@@ -142,7 +144,7 @@ def area_update():
             handler_game.wiznet("%s has just been reset." % area.name, None, None, merc.WIZ_RESETS, 0, 0)
 
         area.age = random.randint(0, 3)
-        school_instance_id = instance.instances_by_room[merc.ROOM_VNUM_SCHOOL][0]
+        school_instance_id = instance.instances_by_room.first_instance_of(merc.ROOM_VNUM_SCHOOL)
         school_instance = instance.rooms[school_instance_id]
         if school_instance and area_id == school_instance.area:
             area.age = 15 - 2
@@ -161,7 +163,7 @@ def m_reset(pReset, last, level, npc):
         logger.error("Reset_area: 'R': bad vnum %d.", pReset.arg3)
         return last, level, npc
     else:
-        roomInstance_id = instance.instances_by_room[pReset.arg3][0]
+        roomInstance_id = instance.instances_by_room.first_instance_of(pReset.arg3)
         roomInstance = instance.global_instances[roomInstance_id]
 
     if npcTemplate.count >= pReset.arg2:
@@ -187,7 +189,7 @@ def m_reset(pReset, last, level, npc):
     # */
 
     if roomInstance.vnum - 1 in instance.room_templates.keys():
-        prevRoomInstance_id = instance.instances_by_room[roomInstance.vnum - 1][0]
+        prevRoomInstance_id = instance.instances_by_room.first_instance_of(roomInstance.vnum - 1)
         prevRoomInstance = instance.global_instances[prevRoomInstance_id]
         if state_checks.IS_SET(prevRoomInstance.room_flags, merc.ROOM_PET_SHOP):
             npc.act.set_bit(merc.ACT_PET)
@@ -213,7 +215,7 @@ def o_reset(pArea, pReset, last, level, npc):
         logger.error("Reset_area: 'R': bad vnum %d.", pReset.arg3)
         return last, level, npc
     else:
-        roomInstance_id = instance.instances_by_room[pReset.arg3][0]
+        roomInstance_id = instance.instances_by_room.first_instance_of(pReset.arg3)
         roomInstance = instance.global_instances[roomInstance_id]
 
     if pArea.player_count > 0 or handler_item.count_obj_list(itemTemplate, roomInstance.items) > 0:
@@ -248,9 +250,9 @@ def p_reset(pArea, pReset, last, level, npc):
     else:
         limit = pReset.arg2
     item_to = None
-    item_to_list = instance.instances_by_item.get(item_toTemplate.vnum, None)
-    if item_to_list:
-        item_to = instance.global_instances[item_to_list[0]]
+    item_to_id = instance.instances_by_item.first_instance_of(item_toTemplate.vnum)
+    if item_to_id:
+        item_to = instance.global_instances[item_to_id]
 
     if pArea.player_count > 0 \
             or not item_to \
@@ -357,7 +359,7 @@ def d_reset(pReset, last, level, npc):
         logger.error("Reset_area: 'D': bad vnum %d.", pReset.arg1)
         return last, level, npc
     else:
-        roomInstance_id = instance.instances_by_room[pReset.arg1][0]
+        roomInstance_id = instance.instances_by_room.first_instance_of(pReset.arg1)
         roomInstance = instance.global_instances[roomInstance_id]
         pexit = roomInstance.exit[pReset.arg2]
     if not pexit:
@@ -384,7 +386,7 @@ def r_reset(pReset, last, level, npc):
         logger.error("Reset_area: 'R': bad vnum %d.", pReset.arg1)
         return last, level, npc
     else:
-        roomInstance_id = instance.instances_by_room[pReset.arg1][0]
+        roomInstance_id = instance.instances_by_room.first_instance_of(pReset.arg1)
         roomInstance = instance.global_instances[roomInstance_id]
     for d0 in range(pReset.arg2 - 1):
         d1 = random.randint(d0, pReset.arg2 - 1)
@@ -4,6 +4,7 @@ import logging
 logger = logging.getLogger()
 
 import merc
+import settings
 import handler_game
 import handler_magic
 import state_checks
@@ -11,6 +12,12 @@ import game_utils
 import instance
 
 
+# What each instance is in, by instance id: (environment id, room, area,
+# living, item), found with one walk up the chain the first time it is
+# asked for.  Moving something forgets it for that and everything inside.
+containment = {}
+
+
 class Environment:
     def __init__(self):
         """
@@ -34,6 +41,8 @@ class Environment:
 
     @environment.setter
     def environment(self, input_value):
+        if self.instance_id:
+            self.forget_containment()
         if not input_value:
             self._environment = None
         elif type(input_value) is int:
@@ -41,41 +50,70 @@ class Environment:
         else:
             raise TypeError('Environment trying to be set with non integer value %r' % type(input_value))
 
-    @property
-    def in_area(self):
+    def forget_containment(self):
+        containment.pop(self.instance_id, None)
+        contents = list(getattr(self, 'inventory', []))  # Areas hold nothing directly
+        if self.is_living:
+            contents.extend(item_id for item_id in self.equipped.values() if item_id)
+        for content_id in contents:
+            content = instance.global_instances.get(content_id, None)
+            if content:
+                content.forget_containment()
+
+    def containment(self):
+        cached = containment.get(self.instance_id) if self.instance_id else None
+        if cached and cached[0] == self._environment:
+            return cached
+        room = area = living = item = None
         current_step = self.environment
         while current_step:
-            if current_step.is_area:
-                return current_step
+            if current_step.is_room and not room:
+                room = current_step
+            elif current_step.is_area and not area:
+                area = current_step
+            elif current_step.is_living and not living:
+                living = current_step
+            elif current_step.is_item and not item:
+                item = current_step
             current_step = current_step.environment
-        return None
+        cached = (self._environment, room, area, living, item)
+        if self.instance_id:
+            containment[self.instance_id] = cached
+        return cached
 
-    @property
-    def in_living(self):
+    def walk_to(self, kind):
         current_step = self.environment
         while current_step:
-            if current_step.is_living:
+            if getattr(current_step, kind):
                 return current_step
             current_step = current_step.environment
         return None
 
+    def contained_in(self, index, kind):
+        found = self.containment()[index]
+        if settings.CONTAINMENT_CHECKS:
+            walked = self.walk_to(kind)
+            if found is not walked:
+                logger.error('Containment cache for %r says %r for %s, walking says %r', self, found, kind, walked)
+                containment.pop(self.instance_id, None)
+                return walked
+        return found
+
     @property
     def in_room(self):
-        current_step = self.environment
-        while current_step:
-            if current_step.is_room:
-                return current_step
-            current_step = current_step.environment
-        return None
+        return self.contained_in(1, 'is_room')
+
+    @property
+    def in_area(self):
+        return self.contained_in(2, 'is_area')
+
+    @property
+    def in_living(self):
+        return self.contained_in(3, 'is_living')
 
     @property
     def in_item(self):
-        current_step = self.environment
-        while current_step:
-            if current_step.is_item:
-                return current_step
-            current_step = current_step.environment
-        return None
+        return self.contained_in(4, 'is_item')
 
     def spread_plague(self, plague_carrier):
         af = [af for af in plague_carrier.affected if af.type == 'plague']
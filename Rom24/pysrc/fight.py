@@ -53,43 +53,71 @@ import settings
 import instance
 
 
+# Everyone in a fight is kept in instance.combatants and
+# instance.fights_by_room, so the violence pass doesn't have to look at
+# the whole world.
+def add_combatant(ch):
+    remove_combatant(ch.instance_id)
+    room_id = ch.in_room.instance_id if ch.in_room else None
+    instance.combatants[ch.instance_id] = room_id
+    instance.fights_by_room.setdefault(room_id, set()).add(ch.instance_id)
+
+
+def remove_combatant(ch_id):
+    if ch_id not in instance.combatants:
+        return
+    room_id = instance.combatants.pop(ch_id)
+    fighters = instance.fights_by_room.get(room_id, None)
+    if fighters is not None:
+        fighters.discard(ch_id)
+        if not fighters:
+            del instance.fights_by_room[room_id]
+
+
 # Control the fights going on.
 # Called periodically by update_handler.
 def violence_update():
-    ch_list = [ch_id for ch_id in instance.characters.keys()]
+    ch_list = list(instance.combatants)
     for character in ch_list:
         ch = instance.characters.get(character, None)
-        if ch:
-            if not ch.fighting or not ch.in_room:
-                continue
-            victim = ch.fighting
-            if ch.is_awake() and ch.in_room == victim.in_room:
-                multi_hit(ch, victim, TYPE_UNDEFINED)
-            else:
-                stop_fighting(ch, False)
-            if not ch.fighting:
-                continue
-            victim = ch.fighting
-            #
-            # * Fun for the whole family!
-            #*/
-            check_assist(ch, victim)
+        if not ch or not ch.fighting:
+            remove_combatant(character)
+            continue
+        if not ch.in_room:
+            continue
+        victim = ch.fighting
+        if ch.is_awake() and ch.in_room == victim.in_room:
+            multi_hit(ch, victim, TYPE_UNDEFINED)
+        else:
+            stop_fighting(ch, False)
+        if not ch.fighting:
+            continue
+        victim = ch.fighting
+        #
+        # * Fun for the whole family!
+        #*/
+        check_assist(ch, victim)
     ch_list = None
     return
 
 
 # for auto assisting */
 def check_assist(ch, victim):
+    # Nobody to help out if everyone here is already fighting.
+    fighting_here = instance.fights_by_room.get(ch.in_room.instance_id, ())
+    if all(rch_id in fighting_here for rch_id in ch.in_room.people):
+        return
     for rch_id in ch.in_room.people[:]:
         rch = instance.characters[rch_id]
-        if state_checks.IS_AWAKE(rch) and rch.fighting is None:
-            # quick check for ASSIST_PLAYER */
-            if not ch.is_npc() and rch.is_npc() \
-                    and rch.off_flags.is_set(ASSIST_PLAYERS) \
-                    and rch.level + 6 > victim.level:
-                rch.do_emote("screams and attacks!")
-                multi_hit(rch, victim, TYPE_UNDEFINED)
-                continue
+        if not state_checks.IS_AWAKE(rch) or rch.fighting is not None:
+            continue
+        # quick check for ASSIST_PLAYER */
+        if not ch.is_npc() and rch.is_npc() \
+                and rch.off_flags.is_set(ASSIST_PLAYERS) \
+                and rch.level + 6 > victim.level:
+            rch.do_emote("screams and attacks!")
+            multi_hit(rch, victim, TYPE_UNDEFINED)
+            continue
         # PCs next */
         if not ch.is_npc() or ch.is_affected(AFF_CHARM):
             if ((not rch.is_npc() and rch.act.is_set(PLR_AUTOASSIST))
@@ -913,15 +941,19 @@ def set_fighting(ch, victim):
 
     ch.fighting = victim
     ch.position = POS_FIGHTING
+    add_combatant(ch)
 
 
 # Stop fights.
 def stop_fighting(ch, fBoth):
-    for fch in instance.characters.values():
+    fighters = [ch] + [instance.characters[fch_id] for fch_id in instance.combatants
+                       if fBoth and fch_id in instance.characters]
+    for fch in fighters:
         if fch.instance_id == ch.instance_id or (fBoth and fch.fighting == ch):
             fch.fighting = None
             fch.position = fch.default_pos if fch.is_npc() else POS_STANDING
             update_pos(fch)
+            remove_combatant(fch.instance_id)
     return
 
 
@@ -425,7 +425,7 @@ def find_location(ch, arg):
         if vnum not in instance.room_templates.keys():
             return None
         else:
-            room_instance = instance.instances_by_room[vnum][0]
+            room_instance = instance.instances_by_room.first_instance_of(vnum)
             return instance.rooms[room_instance]
     victim = ch.get_char_world(arg)
     if victim:
@@ -461,15 +461,20 @@ def old_is_name(arg, name):
 _breakup = re.compile('(\".*?\"|\'.*?\'|[^\s]+)')
 
 
+def name_words(name):
+    words = []
+    for word in _breakup.findall(name.lower()):
+        if word[0] in ('"', "'"):
+            word = word[1:-1]
+        words.append(word)
+    return words
+
+
 def is_name(arg, name):
     if not arg or not name:
         return False
     arg = arg.lower()
-    name = name.lower()
-    words = _breakup.findall(name)
-    for word in words:
-        if word[0] in ('"', "'"):
-            word = word[1:-1]
+    for word in name_words(name):
         if word.startswith(arg):
             return True
     return False
@@ -663,7 +668,7 @@ def find_character(ch, template, target_package):
                     except:
                         room_inventory_list = None
                 else:
-                    npc_id = instance.instances_by_npc[target][arg_num - 1]
+                    npc_id = instance.instances_by_npc.nth_instance_of(target, arg_num)
                     if npc_id:
                         return instance.characters[npc_id]
 
@@ -672,7 +677,7 @@ def find_room(ch, template, target_package):
     if isinstance(target, int):
                 trash = ''
                 try:
-                    room_id = instance.instances_by_room[target][arg_num - 1]
+                    room_id = instance.instances_by_room.nth_instance_of(target, arg_num)
                     return instance.rooms[room_id]
                 except:
                     trash = 'onion bagels!'
@@ -697,7 +702,7 @@ def find_item(ch, template, target_package):
             if final_item:
                 return final_item
         elif ch.is_immortal():
-            item_id = instance.instances_by_item[target][arg_num - 1]
+            item_id = instance.instances_by_item.nth_instance_of(target, arg_num)
             return instance.items.get(item_id, None)
         else:
             return None
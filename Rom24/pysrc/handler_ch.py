@@ -80,7 +80,7 @@ def move_char(ch, door, follow):
         for gn, guild in const.guild_table.items():
             for room_vnum in guild.guild_rooms:
                 if room_vnum in instance.instances_by_room:
-                    room_id = instance.instances_by_room[room_vnum][0]
+                    room_id = instance.instances_by_room.first_instance_of(room_vnum)
                     room = instance.rooms[room_id]
                     if guild != ch.guild and to_room.instance_id == room.instance_id:
                         ch.send("You aren't allowed in there.\n")
@@ -35,6 +35,7 @@ __author__ = 'syn'
 
 import copy
 import json
+import random
 import logging
 
 logger = logging.getLogger()
@@ -46,6 +47,8 @@ import game_utils
 import merc
 import state_checks
 import instance
+import timer_wheel
+import update
 
 
 class SOCIAL_DATA:
@@ -62,11 +65,17 @@ class SOCIAL_DATA:
 
 
 # An affect.
+# On a character, the duration is kept as a timer on the pulse wheel, due on
+# the tick after it runs out, when ROM takes it off.  Spell strength fading
+# is scheduled the same way, one timer for each tick the level drops.
 class AFFECT_DATA:
     load_count = 0
 
     def __init__(self, **kwargs):
         AFFECT_DATA.load_count += 1
+        self._owner = None  # Character instance_id, while timing on one
+        self._expiry_timer = None
+        self._fade_timer = None
         self.valid = True
         self.where = 0
         self.type = 0
@@ -78,6 +87,65 @@ class AFFECT_DATA:
         if kwargs:
             [setattr(self, k, copy.deepcopy(v)) for k, v in kwargs.items()]
 
+    @property
+    def duration(self):
+        if self._expiry_timer and self._expiry_timer.active:
+            return max(0, -(-self._expiry_timer.remaining // merc.PULSE_TICK) - 1)
+        return self._duration
+
+    @duration.setter
+    def duration(self, value):
+        self._duration = value
+        if self._owner is not None:
+            self.schedule()
+
+    def start_timing(self, owner):
+        # Called when the affect goes on a character.
+        self._owner = owner.instance_id
+        self.schedule()
+
+    def stop_timing(self):
+        # Called when it comes off again.
+        self._duration = self.duration
+        self._owner = None
+        self.cancel_timers()
+
+    def cancel_timers(self):
+        for timer in (self._expiry_timer, self._fade_timer):
+            if timer:
+                timer.cancel()
+        self._expiry_timer = None
+        self._fade_timer = None
+
+    def schedule(self):
+        self.cancel_timers()
+        if self._duration < 0:
+            return
+        self._expiry_timer = timer_wheel.schedule(update.point_timer.remaining + self._duration * merc.PULSE_TICK,
+                                                  update.affect_expired, self._owner, self)
+        self.schedule_fade()
+
+    def schedule_fade(self):
+        # Spell strength fades with time, a one in five chance each tick it has left to run.
+        ticks = 1
+        while random.randint(0, 4) != 0:
+            ticks += 1
+        if self.level > 0 and ticks <= self.duration:
+            self._fade_timer = timer_wheel.schedule(update.point_timer.remaining + (ticks - 1) * merc.PULSE_TICK,
+                                                    update.affect_faded, self)
+        else:
+            self._fade_timer = None
+
+    def copy(self):
+        # A copy that isn't timing on anyone.
+        paf = AFFECT_DATA()
+        paf.__dict__ = self.__dict__.copy()
+        paf._owner = None
+        paf._expiry_timer = None
+        paf._fade_timer = None
+        paf._duration = self.duration
+        return paf
+
     def to_json(self, outer_encoder=None):
         if outer_encoder is None:
             outer_encoder = json.JSONEncoder.default
@@ -86,6 +154,10 @@ class AFFECT_DATA:
         for k, v in self.__dict__.items():
             if str(type(v)) in ("<class 'function'>", "<class 'method'>"):
                 continue
+            elif str(k) in ('_owner', '_expiry_timer', '_fade_timer'):
+                continue
+            elif str(k) == '_duration':
+                tmp_dict['duration'] = self.duration
             else:
                 tmp_dict[k] = v
 
@@ -132,9 +204,14 @@ class weather_data:
 time_info = time_info_data()
 weather_info = weather_data()
 
-def act(format, ch, arg1=None, arg2=None, send_to=merc.TO_ROOM, min_pos=merc.POS_RESTING):
+# droppable output (channels, things happening to others) may be thrown away
+# for a client that is not keeping up; by default that is everything but
+# messages to ch or the victim.
+def act(format, ch, arg1=None, arg2=None, send_to=merc.TO_ROOM, min_pos=merc.POS_RESTING, droppable=None):
     if not format:
         return
+    if droppable is None:
+        droppable = send_to == merc.TO_ROOM or send_to == merc.TO_NOTVICT
     if not ch or not ch.in_room:
         return
 
@@ -190,7 +267,7 @@ def act(format, ch, arg1=None, arg2=None, send_to=merc.TO_ROOM, min_pos=merc.POS
         act_trans['$d'] = arg2 if not arg2 else "door"
 
         format = game_utils.mass_replace(format, act_trans)
-        to.send(format+"\n")
+        to.send(format+"\n", droppable=droppable)
     return
 
 def wiznet( string, ch, obj, flag, flag_skip, min_level):
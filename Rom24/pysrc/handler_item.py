@@ -44,6 +44,7 @@ import instance
 import settings
 import equipment
 import game_utils
+import name_index
 import type_bypass
 import inventory
 import physical
@@ -53,6 +54,8 @@ import object_creator
 import merc
 import state_checks
 import item_flags
+import timer_wheel
+import update
 
 # * One object.
 
@@ -139,6 +142,7 @@ class Items(instance.Instancer, environment.Environment, physical.Physical, inve
         self.cost = 0
         self.level = 0
         self.condition = 0
+        self._decay_timer = None
         self.timer = 0
         self.value = [0] * 5
         self.flags = item_flags.ItemFlags()
@@ -173,6 +177,28 @@ class Items(instance.Instancer, environment.Environment, physical.Physical, inve
         else:
             return "<Item Instance: %s : ID %d VNUM %d>" % (self.short_descr, self.instance_id, self.vnum)
 
+    # The timer counts down a tick at a time.  On a live item it is kept as a
+    # timer on the pulse wheel, due on the tick it runs out.
+    @property
+    def timer(self):
+        if self._decay_timer and self._decay_timer.active:
+            return -(-self._decay_timer.remaining // merc.PULSE_TICK)
+        return 0 if self.instance_id else self._timer
+
+    @timer.setter
+    def timer(self, value):
+        self._timer = max(0, value)
+        if self.instance_id:
+            self.schedule_decay()
+
+    def schedule_decay(self):
+        if self._decay_timer:
+            self._decay_timer.cancel()
+            self._decay_timer = None
+        if self._timer > 0:
+            delay = update.point_timer.remaining + (self._timer - 1) * merc.PULSE_TICK
+            self._decay_timer = timer_wheel.schedule(delay, update.decay_due, self.instance_id)
+
     #Equipped/Equips To
     @property
     def equipped_to(self):
@@ -334,7 +360,7 @@ class Items(instance.Instancer, environment.Environment, physical.Physical, inve
 
     def get(self, instance_object):
         if instance_object.is_item and instance_object.instance_id in self.inventory:
-            self.inventory.remove(instance_object.instance_id)
+            self.inventory_remove(instance_object)
             self.carry_number -= instance_object.get_number()
             self.carry_weight -= instance_object.get_weight() * state_checks.WEIGHT_MULT(self) // 100
             instance_object.environment = None
@@ -344,7 +370,7 @@ class Items(instance.Instancer, environment.Environment, physical.Physical, inve
 
     def put(self, instance_object):
         if instance_object.is_item and instance_object.instance_id not in self.inventory:
-            self.inventory += [instance_object.instance_id]
+            self.inventory_add(instance_object)
             self.carry_weight += instance_object.get_weight() * state_checks.WEIGHT_MULT(self) // 100
             self.carry_number += instance_object.get_number()
             instance_object.environment = self.instance_id
@@ -356,13 +382,19 @@ class Items(instance.Instancer, environment.Environment, physical.Physical, inve
     def instance_setup(self):
         instance.items[self.instance_id] = self
         instance.global_instances[self.instance_id] = self
-        if self.vnum not in instance.instances_by_item.keys():
-            instance.instances_by_item[self.vnum] = [self.instance_id]
-        else:
-            instance.instances_by_item[self.vnum] += [self.instance_id]
+        name_index.items.add(self.instance_id, self.name)
+        instance.instances_by_item.add(self.vnum, self.instance_id)
+        self.schedule_decay()
+        if [paf for paf in self.affected if paf.duration >= 0]:
+            instance.timed_affect_items.add(self.instance_id)
 
     def instance_destructor(self):
-        instance.instances_by_item[self.vnum].remove(self.instance_id)
+        self.forget_containment()
+        instance.instances_by_item.remove(self.vnum, self.instance_id)
+        name_index.items.remove(self.instance_id)
+        instance.timed_affect_items.discard(self.instance_id)
+        if self._decay_timer:
+            self._decay_timer.cancel()
         del instance.items[self.instance_id]
         del instance.global_instances[self.instance_id]
         # Remove an object.
@@ -397,8 +429,10 @@ class Items(instance.Instancer, environment.Environment, physical.Physical, inve
     # give an affect to an object */
 
     def affect_add(self, paf):
-        paf_new = handler_game.AFFECT_DATA()
+        paf_new = paf.copy()
         self.affected.append(paf_new)
+        if paf_new.duration >= 0 and self.instance_id:
+            instance.timed_affect_items.add(self.instance_id)
         # apply any affect vectors to the object's extra_flags
         if paf.bitvector:
             if paf.where == merc.TO_OBJECT:
@@ -491,6 +525,12 @@ class Items(instance.Instancer, environment.Environment, physical.Physical, inve
                 continue
             elif str(k) in ('_last_saved', '_md5'):
                 continue
+            elif str(k) in ('_people', '_items', '_typed_inventory'):
+                continue
+            elif str(k) == '_decay_timer':
+                continue
+            elif str(k) == '_timer':
+                tmp_dict['timer'] = self.timer
             else:
                 tmp_dict[k] = v
 
@@ -47,6 +47,8 @@ import handler_item
 import json
 import settings
 import instance
+import name_index
+import state_checks
 
 
 class Npc(living.Living):
@@ -117,13 +119,19 @@ class Npc(living.Living):
         instance.global_instances[self.instance_id] = self
         instance.npcs[self.instance_id] = self
         instance.characters[self.instance_id] = self
-        if self.vnum not in instance.instances_by_npc.keys():
-            instance.instances_by_npc[self.vnum] = [self.instance_id]
-        else:
-            instance.instances_by_npc[self.vnum] += [self.instance_id]
+        name_index.characters.add(self.instance_id, self.name)
+        state_checks.WAIT_STATE(self, self.wait)
+        state_checks.DAZE_STATE(self, self.daze)
+        for paf in self.affected:
+            paf.start_timing(self)
+        instance.instances_by_npc.add(self.vnum, self.instance_id)
 
     def instance_destructor(self):
-        instance.instances_by_npc[self.vnum].remove(self.instance_id)
+        self.forget_containment()
+        for paf in self.affected:
+            paf.stop_timing()
+        instance.instances_by_npc.remove(self.vnum, self.instance_id)
+        name_index.characters.remove(self.instance_id)
         del instance.npcs[self.instance_id]
         del instance.characters[self.instance_id]
         del instance.global_instances[self.instance_id]
@@ -144,6 +152,8 @@ class Npc(living.Living):
                 continue
             elif str(k) in ('_last_saved', '_md5'):
                 continue
+            elif str(k) in ('_people', '_items', '_typed_inventory'):
+                continue
             else:
                 tmp_dict[k] = v
 
@@ -9,6 +9,7 @@ import logging
 logger = logging.getLogger()
 
 import game_utils
+import name_index
 import handler_log
 import instance
 import handler_game
@@ -112,13 +113,22 @@ class Pc(living.Living):
         instance.global_instances[self.instance_id] = self
         instance.characters[self.instance_id] = self
         instance.players[self.instance_id] = self
+        name_index.characters.add(self.instance_id, self.name)
+        state_checks.WAIT_STATE(self, self.wait)
+        state_checks.DAZE_STATE(self, self.daze)
+        for paf in self.affected:
+            paf.start_timing(self)
         if self.name not in instance.instances_by_player.keys():
             instance.instances_by_player[self.name] = [self.instance_id]
         else:
             instance.instances_by_player[self.name] += [self.instance_id]
 
     def instance_destructor(self):
+        self.forget_containment()
+        for paf in self.affected:
+            paf.stop_timing()
         instance.instances_by_player[self.name].remove(self.instance_id)
+        name_index.characters.remove(self.instance_id)
         del instance.players[self.instance_id]
         del instance.characters[self.instance_id]
         del instance.global_instances[self.instance_id]
@@ -580,6 +590,8 @@ class Pc(living.Living):
                 continue
             elif str(k) in ('_last_saved', '_md5'):
                 continue
+            elif str(k) in ('_people', '_items', '_typed_inventory'):
+                continue
             else:
                 tmp_dict[k] = v
 
@@ -122,13 +122,19 @@ class Room(instance.Instancer, environment.Environment, inventory.Inventory, typ
 
     def put(self, instance_object):
         if not instance_object.instance_id in self.inventory:
-            self.inventory += [instance_object.instance_id]
+            self.inventory_add(instance_object)
             instance_object._room_vnum = self.vnum
+            if self.in_area:
+                self.in_area.occupy(instance_object)
         else:
             raise ValueError('Instance already present in room inventory %d' % instance_object.instance_id)
         if instance_object.is_living:
             if not instance_object.is_npc():
                     self.in_area.add_pc(instance_object)
+            elif instance_object.act.is_set(merc.ACT_UPDATE_ALWAYS):
+                    self.in_area.wake()
+            if not instance_object.is_npc() or instance_object.act.is_set(merc.ACT_AGGRESSIVE):
+                instance.pending_aggression.add(self.instance_id)
             if instance_object.slots.light and instance_object.slots.light.value[2] != 0:
                 self.available_light += 1
             if instance_object.is_affected(merc.AFF_PLAGUE):
@@ -146,8 +152,10 @@ class Room(instance.Instancer, environment.Environment, inventory.Inventory, typ
 
     def get(self, instance_object):
         if instance_object.instance_id in self.inventory:
-            self.inventory.remove(instance_object.instance_id)
+            self.inventory_remove(instance_object)
             instance_object._room_vnum = None
+            if self.in_area:
+                self.in_area.vacate(instance_object)
         else:
             raise KeyError('Instance is not in room inventory, trying to be removed %d' % instance_object.instance_id)
         if instance_object.is_living:
@@ -173,13 +181,11 @@ class Room(instance.Instancer, environment.Environment, inventory.Inventory, typ
     def instance_setup(self):
         instance.global_instances[self.instance_id] = self
         instance.rooms[self.instance_id] = self
-        if self.vnum not in instance.instances_by_room.keys():
-            instance.instances_by_room[self.vnum] = [self.instance_id]
-        else:
-            instance.instances_by_room[self.vnum] += [self.instance_id]
+        instance.instances_by_room.add(self.vnum, self.instance_id)
 
     def instance_destructor(self):
-        instance.instances_by_room[self.vnum].remove(self.instance_id)
+        self.forget_containment()
+        instance.instances_by_room.remove(self.vnum, self.instance_id)
         del instance.rooms[self.instance_id]
         del instance.global_instances[self.instance_id]
 
@@ -218,6 +224,8 @@ class Room(instance.Instancer, environment.Environment, inventory.Inventory, typ
                 continue
             elif str(k) in ('_last_saved', '_md5'):
                 continue
+            elif str(k) in ('_people', '_items', '_typed_inventory'):
+                continue
             elif str(k) == 'inventory' and v is not None:
                 # We need to save the inventory special to keep the type data with it.
                 t = 'special_inventory'
@@ -319,7 +327,7 @@ class Room(instance.Instancer, environment.Environment, inventory.Inventory, typ
 
 
 def get_room_by_vnum(vnum):
-    room_id = instance.instances_by_room[vnum][0]
+    room_id = instance.instances_by_room.first_instance_of(vnum)
     return instance.rooms[room_id]
 
 def get_random_room(ch):
@@ -32,21 +32,43 @@
  ************/
 """
 import os
+import collections
+import ctypes
+import ctypes.util
 import importlib
+import struct
+import sys
+import threading
+import time
 import traceback
 import logging
 
 logger = logging.getLogger()
 
+import settings
+
 # dictionary of files to track. will be key'd by file name and the value will be modified unix timestamp
 tracked_files = {}
 modified_files = {}
 
+# Paths the watcher thread has seen change, waiting for the game loop to pick them up.
+# Appending and popping a deque is thread safe, and checking it costs no system calls.
+changed_paths = collections.deque()
+watcher = None
+
+# From <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct('iIII')
+
 
 def init_file(path, modules, silent=False):
     #called by init_monitoring to begin tracking a file.
     modules = [importlib.import_module(m) for m in modules]
-    tracked_files[path] = [os.path.getmtime(path), modules]
+    tracked_files[os.path.normpath(path)] = [os.path.getmtime(path), modules]
     if not silent:
         logger.info('    Tracking %s', path)
     else:
@@ -79,18 +101,102 @@ def init_monitoring():
     init_file('fight.py', ['fight'])
     init_directory(os.path.join('commands'))
     init_directory(os.path.join('spells'))
+    start_watcher()
     logger.info('done. (Monitoring system)')
 
 
+def file_changed(path):
+    #Called from the watcher thread.  Only notes the path, the game loop does the rest.
+    path = os.path.normpath(path)
+    if path in tracked_files:
+        changed_paths.append(path)
+
+
+def inotify_watcher(directories):
+    #Returns a thread that blocks on inotify for changes in directories, or None if we can't.
+    if not sys.platform.startswith('linux') or not settings.HOTFIX_USE_INOTIFY:
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(IN_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        logger.warn('inotify_init1 failed: %s', os.strerror(ctypes.get_errno()))
+        return None
+
+    # Watch the directories rather than the files, editors often save by
+    # writing a new file and renaming it over the old one.
+    watches = {}
+    for directory in directories:
+        wd = libc.inotify_add_watch(fd, os.fsencode(directory), IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE)
+        if wd < 0:
+            logger.warn('inotify_add_watch on %s failed: %s', directory, os.strerror(ctypes.get_errno()))
+            os.close(fd)
+            return None
+        watches[wd] = directory
+
+    def read_events():
+        while True:
+            data = os.read(fd, 64 * 1024)
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if wd in watches and name:
+                    file_changed(os.path.join(watches[wd], os.fsdecode(name)))
+
+    return threading.Thread(target=read_events, name='hotfix-inotify', daemon=True)
+
+
+def polling_watcher():
+    #Returns a thread that stats the tracked files every so often, for when inotify isn't there.
+    mtimes = {path: pair[0] for path, pair in tracked_files.items()}
+
+    def check_files():
+        while True:
+            time.sleep(settings.HOTFIX_POLL_INTERVAL)
+            for path in list(mtimes):
+                try:
+                    mtime = os.path.getmtime(path)
+                except OSError:
+                    continue
+                if mtime != mtimes[path]:
+                    mtimes[path] = mtime
+                    file_changed(path)
+
+    return threading.Thread(target=check_files, name='hotfix-poll', daemon=True)
+
+
+def start_watcher():
+    global watcher
+    if watcher:
+        return
+    directories = sorted(set(os.path.dirname(path) or os.curdir for path in tracked_files))
+    watcher = inotify_watcher(directories)
+    if watcher:
+        logger.info('Watching %d directories with inotify', len(directories))
+    else:
+        watcher = polling_watcher()
+        logger.info('Polling %d files every %s seconds', len(tracked_files), settings.HOTFIX_POLL_INTERVAL)
+    watcher.start()
+
+
 def poll_files():
-    #Called in game_loop of program to check if files have been modified.
-    for fp, pair in tracked_files.items():
-        mod, modules = pair
-        if mod != os.path.getmtime(fp):
-            #File has been modified.
-            logger.warn('%s has been modified', fp)
+    #Called in game_loop of program to pick up files the watcher saw change.
+    while changed_paths:
+        fp = changed_paths.popleft()
+        if fp in modified_files:
+            continue
+        #File has been modified.
+        logger.warn('%s has been modified', fp)
+        try:
             tracked_files[fp][0] = os.path.getmtime(fp)
-            modified_files[fp] = [os.path.getmtime(fp), modules]
+        except OSError:
+            pass
+        modified_files[fp] = list(tracked_files[fp])
 
 
 def reload_files(ch):
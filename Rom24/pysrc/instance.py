@@ -35,6 +35,7 @@ __author__ = 'quixadhal'
 
 import os
 import json
+import itertools
 from collections import OrderedDict, namedtuple
 import re
 import logging
@@ -91,18 +92,68 @@ helps = {}
 socials = {}
 resets = {}
 
+
+class InstanceIndex(dict):
+    """
+    Instance ids by vnum.  Each vnum's ids are kept in an OrderedDict, in
+    the order they were made, so adding or removing one costs the same
+    however many of a thing there are.
+    """
+
+    def add(self, vnum, instance_id):
+        if vnum not in self:
+            self[vnum] = OrderedDict()
+        self[vnum][instance_id] = None
+
+    def remove(self, vnum, instance_id):
+        instance_ids = self.get(vnum, None)
+        if instance_ids is None:
+            return
+        instance_ids.pop(instance_id, None)
+        if not instance_ids:
+            del self[vnum]
+
+    def first_instance_of(self, vnum):
+        for instance_id in self.get(vnum, ()):
+            return instance_id
+        return None
+
+    def nth_instance_of(self, vnum, number):
+        # Counting from 1, as in 2.sword
+        if number < 1:
+            return None
+        for instance_id in itertools.islice(self.get(vnum, ()), number - 1, None):
+            return instance_id
+        return None
+
+
 '''
 Contains lists of instances,
 Key: string VNUM
 Value: list Instance_ID of object associated with Key:VNUM
+The item, room and npc ones are InstanceIndexes, see above.
 '''
 instances_by_area = {}
-instances_by_item = {}
-instances_by_room = {}
-instances_by_npc = {}
+instances_by_item = InstanceIndex()
+instances_by_room = InstanceIndex()
+instances_by_npc = InstanceIndex()
 instances_by_shop = {}
 instances_by_player = {}
 
+# Everyone in a fight, kept by fight.set_fighting and stop_fighting.
+# combatants maps a fighter to the room the fight started in, and
+# fights_by_room is the other way round.  They live here so a hotfix
+# reload of fight doesn't forget who is fighting.
+combatants = {}
+fights_by_room = {}
+
+# Rooms a player or an aggressive mob has walked into.  aggr_update only
+# looks at these, and drops each one once it no longer holds both.
+pending_aggression = set()
+
+# Items with affects that run out, for item_update to count down.
+timed_affect_items = set()
+
 # Things to omit from instances that are in templates.
 not_to_instance = []
 
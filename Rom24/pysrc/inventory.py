@@ -1,3 +1,5 @@
+import collections
+import collections.abc
 import logging
 
 logger = logging.getLogger()
@@ -7,20 +9,102 @@ import merc
 import instance
 
 
+class Contents(collections.abc.Sequence):
+    """
+    The people or the items in something, by instance_id, in the order they
+    came in.  Read-only to everyone but Inventory.  Adding or removing one
+    costs the same however many there are; looping over it goes through a
+    tuple made the first time after a change, so things can come and go
+    during the loop.
+    """
+    __slots__ = ['_ids', '_tuple']
+
+    def __init__(self, ids=()):
+        self._ids = collections.OrderedDict((instance_id, None) for instance_id in ids)
+        self._tuple = None
+
+    def _add(self, instance_id):
+        self._ids[instance_id] = None
+        self._tuple = None
+
+    def _remove(self, instance_id):
+        if instance_id in self._ids:
+            del self._ids[instance_id]
+            self._tuple = None
+
+    def _as_tuple(self):
+        if self._tuple is None:
+            self._tuple = tuple(self._ids)
+        return self._tuple
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, instance_id):
+        return instance_id in self._ids
+
+    def __iter__(self):
+        return iter(self._as_tuple())
+
+    def __getitem__(self, index):
+        return self._as_tuple()[index]
+
+    def __repr__(self):
+        return 'Contents(%r)' % (self._as_tuple(),)
+
+
 class Inventory:
     def __init__(self):
         super().__init__()
         self.inventory = []
         self.carry_weight = 0
         self.carry_number = 0
+        # People and items are kept apart as things come and go, so reading
+        # them doesn't mean sorting the inventory.  They are only good for
+        # the list they were sorted from; if inventory is replaced wholesale,
+        # as loading does, they are sorted out again on the next read.
+        self._people = Contents()
+        self._items = Contents()
+        self._typed_inventory = self.inventory
 
     @property
     def people(self):
-            return tuple(char_id for char_id in self.inventory if char_id in instance.characters)
+        if self._typed_inventory is not self.inventory:
+            self.sort_inventory()
+        return self._people
 
     @property
     def items(self):
-            return tuple(item_id for item_id in self.inventory if item_id in instance.items)
+        if self._typed_inventory is not self.inventory:
+            self.sort_inventory()
+        return self._items
+
+    def sort_inventory(self):
+        self._people = Contents(char_id for char_id in self.inventory if char_id in instance.characters)
+        self._items = Contents(item_id for item_id in self.inventory if item_id in instance.items)
+        # Contents still being loaded are neither yet; try again next time.
+        if len(self._people) + len(self._items) == len(self.inventory):
+            self._typed_inventory = self.inventory
+        else:
+            self._typed_inventory = None
+
+    def inventory_add(self, instance_object):
+        self.inventory.append(instance_object.instance_id)
+        if self._typed_inventory is not self.inventory:
+            return
+        if instance_object.is_living:
+            self._people._add(instance_object.instance_id)
+        elif instance_object.is_item:
+            self._items._add(instance_object.instance_id)
+
+    def inventory_remove(self, instance_object):
+        self.inventory.remove(instance_object.instance_id)
+        if self._typed_inventory is not self.inventory:
+            return
+        if instance_object.is_living:
+            self._people._remove(instance_object.instance_id)
+        elif instance_object.is_item:
+            self._items._remove(instance_object.instance_id)
 
     def can_carry_n(self):
         if not self.is_npc() and self.level >= merc.LEVEL_IMMORTAL:
@@ -49,6 +49,7 @@ import bit
 import const
 import fight
 import game_utils
+import name_index
 import immortal
 import environment
 import state_checks
@@ -304,7 +305,7 @@ class Living(immortal.Immortal, Fight, Grouping, physical.Physical,
 
     def get(self, instance_object):
         if instance_object.is_item and instance_object.instance_id in self.inventory:
-            self.inventory.remove(instance_object.instance_id)
+            self.inventory_remove(instance_object)
             self.carry_number -= instance_object.get_number()
             self.carry_weight -= instance_object.get_weight()
             instance_object.environment = None
@@ -318,7 +319,7 @@ class Living(immortal.Immortal, Fight, Grouping, physical.Physical,
 
     def put(self, instance_object):
         #if instance_object.is_item:
-        self.inventory += [instance_object.instance_id]
+        self.inventory_add(instance_object)
         instance_object.environment = self.instance_id
         if not instance_object.instance_id in self.equipped.values():
             self.carry_number += instance_object.get_number()
@@ -328,7 +329,7 @@ class Living(immortal.Immortal, Fight, Grouping, physical.Physical,
             raise KeyError('Item is in equipped dict, run, screaming! %d' % instance_object.instance_id)
 
 
-    def send(self, pstr):
+    def send(self, pstr, **kwargs):
         pass
 
     def is_npc(self):
@@ -653,7 +654,7 @@ class Living(immortal.Immortal, Fight, Grouping, physical.Physical,
 
         # Death room is set in the clan table now
         if not fPull:
-            room_id = instance.instances_by_room[self.clan.hall][0]
+            room_id = instance.instances_by_room.first_instance_of(self.clan.hall)
             room = instance.rooms[room_id]
             if self.in_room:
                 self.in_room.get(self)
@@ -704,8 +705,8 @@ class Living(immortal.Immortal, Fight, Grouping, physical.Physical,
             return wch
         number, arg = game_utils.number_argument(argument)
         arg = arg.lower()
-        ch_list = [instance.characters[wch_id] for wch_id in sorted(instance.characters.keys())
-                   if game_utils.is_name(arg, instance.characters[wch_id].name)]
+        ch_list = [instance.characters[wch_id] for wch_id in name_index.characters.find(arg)
+                   if wch_id in instance.characters and game_utils.is_name(arg, instance.characters[wch_id].name)]
         if ch_list:
             try:
                 if ch.can_see(ch_list[number - 1]):
@@ -778,8 +779,8 @@ class Living(immortal.Immortal, Fight, Grouping, physical.Physical,
             return item
         number, arg = game_utils.number_argument(argument)
         arg = arg.lower()
-        item_list = [instance.items[item_id] for item_id in sorted(instance.items.keys())
-                     if game_utils.is_name(arg, instance.items[item_id].name)]
+        item_list = [instance.items[item_id] for item_id in name_index.items.find(arg)
+                     if item_id in instance.items and game_utils.is_name(arg, instance.items[item_id].name)]
         if item_list:
             try:
                 if ch.can_see_item(item_list[number - 1]):
@@ -1154,7 +1155,7 @@ class Living(immortal.Immortal, Fight, Grouping, physical.Physical,
         if item.flags.two_handed and self.slots.off_hand:
             self.equipped['off_hand'] = None
         self.equipped[item.equipped_to] = None
-        self.inventory += [item.instance_id]
+        self.inventory_add(item)
         self.remove_affect(item)
         if item.flags.light and item.value[2] != 0 and self.in_room and self.in_room.available_light > 0:
             self.in_room.available_light -= 1
@@ -0,0 +1,322 @@
+"""
+Headless telnet load generator for Pyom.
+
+Opens a swarm of bot connections to a running server.  Each bot logs in
+through nanny (creating its character the first time), then runs a weighted
+command script until the test ends.  At the end it reports command latency
+(command sent to prompt received), an estimate of pulse lag and throughput.
+
+    python3 loadtest.py --bots 2000 --duration 300
+    python3 loadtest.py --bots 50 --script fighter --host 10.0.0.5
+
+Run it against a test server; the bots' characters are saved like any
+other player's.
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+
+logger = logging.getLogger()
+
+import merc
+import settings
+from bot_scripts import SCRIPTS, bot_name, scripted_command
+
+IAC = 255
+GA = 249
+SB = 250
+SE = 240
+
+PASSWORD = 'loadtest'
+
+# What nanny asks, and how a bot answers.  First match wins.
+LOGIN_REPLIES = [
+    ('Did I get that right', lambda bot: 'y'),
+    ('Give me a password', lambda bot: PASSWORD),
+    ('Please retype password', lambda bot: PASSWORD),
+    ('Password:', lambda bot: PASSWORD),
+    ('Do you wish to connect anyway', lambda bot: 'y'),
+    ('What is your race', lambda bot: 'human'),
+    ('What is your sex', lambda bot: random.choice('mf')),
+    ('Select a class', lambda bot: bot.guild),
+    ('Which alignment', lambda bot: random.choice('gne')),
+    ('Customize (Y/N)', lambda bot: 'n'),
+    ('Your choice?', lambda bot: bot.pick_weapon()),
+    ('[Hit Return to continue]', lambda bot: ''),
+]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.login_times = []
+        self.commands = 0
+        self.bytes_received = 0
+        self.connected = 0
+        self.playing = 0
+        self.failed = 0
+        self.started = time.time()
+
+    def report(self, probe):
+        elapsed = max(0.001, time.time() - self.started)
+        ms = [latency * 1000 for latency in self.latencies]
+        lines = ['Bots: %d connected, %d playing, %d failed' % (self.connected, self.playing, self.failed),
+                 'Commands: %d in %.1fs, %.1f/s; %.1f KB/s received' % (
+                     self.commands, elapsed, self.commands / elapsed, self.bytes_received / elapsed / 1024),
+                 'Latency ms: p50 %.1f  p90 %.1f  p99 %.1f  max %.1f' % (
+                     percentile(ms, 50), percentile(ms, 90), percentile(ms, 99), max(ms) if ms else 0)]
+        if self.login_times:
+            lines.append('Login s: p50 %.2f  p99 %.2f' % (percentile(self.login_times, 50),
+                                                          percentile(self.login_times, 99)))
+        if probe.samples:
+            lag = [max(0.0, sample - probe.baseline) * 1000 for sample in probe.samples]
+            lines.append('Pulse lag ms (probe over idle %.1f): p50 %.1f  p99 %.1f  max %.1f' % (
+                probe.baseline * 1000, percentile(lag, 50), percentile(lag, 99), max(lag)))
+        return '\n'.join(lines)
+
+
+class Bot:
+    """
+    One telnet connection.  Strips telnet negotiation (the bot refuses
+    nothing and agrees to nothing) and treats IAC GA, which follows every
+    prompt, as the end of a command's response.
+    """
+
+    def __init__(self, args, number, stats):
+        self.args = args
+        self.name = bot_name(args.prefix, number)
+        self.guild = random.choice(['mage', 'cleric', 'thief', 'warrior'])
+        self.script = SCRIPTS[args.script]
+        self.stats = stats
+        self.reader = None
+        self.writer = None
+        self.text = ''
+        self.answered = None
+        self.prompted = asyncio.Event()
+        self.playing = asyncio.Event()
+        self.iac_state = None
+
+    def pick_weapon(self):
+        # The choices are listed on the line before the question.
+        lines = [line for line in self.text.splitlines() if line.strip() and 'choice' not in line]
+        return lines[-1].split()[0] if lines else 'dagger'
+
+    def command(self):
+        return scripted_command(self.script)
+
+    @asyncio.coroutine
+    def send(self, line):
+        self.writer.write((line + '\r\n').encode('cp1252'))
+        yield from self.writer.drain()
+
+    def feed(self, data):
+        # Telnet: drop negotiation, spot GA.
+        text = bytearray()
+        for byte in data:
+            if self.iac_state is None:
+                if byte == IAC:
+                    self.iac_state = IAC
+                else:
+                    text.append(byte)
+            elif self.iac_state == IAC:
+                if byte == GA:
+                    self.prompted.set()
+                    self.iac_state = None
+                elif byte == SB:
+                    self.iac_state = SB
+                elif byte == IAC:
+                    text.append(byte)
+                    self.iac_state = None
+                elif byte >= SB:
+                    self.iac_state = 'option'
+                else:
+                    self.iac_state = None
+            elif self.iac_state == 'option':
+                self.iac_state = None
+            elif self.iac_state == SB:
+                if byte == IAC:
+                    self.iac_state = 'sb-iac'
+            elif self.iac_state == 'sb-iac':
+                self.iac_state = None if byte == SE else SB
+        self.text = (self.text + text.decode('cp1252'))[-4096:]
+
+    @asyncio.coroutine
+    def read_loop(self):
+        while True:
+            data = yield from self.reader.read(65536)
+            if not data:
+                return
+            self.stats.bytes_received += len(data)
+            self.feed(data)
+            if not self.playing.is_set():
+                yield from self.answer_login()
+
+    @asyncio.coroutine
+    def answer_login(self):
+        # Only playing characters get a prompt.
+        if self.prompted.is_set() or 'Welcome to ROM' in self.text:
+            self.playing.set()
+            return
+        for question, reply in LOGIN_REPLIES:
+            if question in self.text:
+                answer = reply(self)
+                self.text = ''
+                self.answered = question
+                yield from self.send(answer)
+                return
+
+    @asyncio.coroutine
+    def run(self, stop_at):
+        try:
+            self.reader, self.writer = yield from asyncio.open_connection(self.args.host, self.args.port)
+        except OSError as err:
+            logger.warning('%s could not connect: %s', self.name, err)
+            self.stats.failed += 1
+            return
+        self.stats.connected += 1
+        reading = asyncio.ensure_future(self.read_loop())
+        try:
+            start = time.time()
+            yield from asyncio.sleep(0.5)  # Greeting
+            yield from self.send(self.name)
+            yield from asyncio.wait_for(self.playing.wait(), self.args.login_timeout)
+            self.stats.login_times.append(time.time() - start)
+            self.stats.playing += 1
+            yield from self.send('')
+            while time.time() < stop_at and not reading.done():
+                yield from asyncio.sleep(random.expovariate(1.0 / self.args.think))
+                yield from self.timed(self.command())
+        except asyncio.TimeoutError:
+            logger.warning('%s got stuck logging in after %r at: %r', self.name, self.answered, self.text[-80:])
+            self.stats.failed += 1
+        except ConnectionError:
+            self.stats.failed += 1
+        finally:
+            reading.cancel()
+            self.writer.close()
+
+    @asyncio.coroutine
+    def timed(self, line):
+        self.prompted.clear()
+        sent = time.time()
+        yield from self.send(line)
+        try:
+            yield from asyncio.wait_for(self.prompted.wait(), self.args.command_timeout)
+        except asyncio.TimeoutError:
+            return None
+        latency = time.time() - sent
+        self.stats.latencies.append(latency)
+        self.stats.commands += 1
+        return latency
+
+
+class Probe(Bot):
+    """
+    A bot that only ever types 'time', which costs the server next to
+    nothing.  Its latency before the swarm arrives is the baseline, and
+    anything over that under load is the game loop running late.
+    """
+
+    def __init__(self, args):
+        super().__init__(args, 0, Stats())
+        self.name = bot_name(args.prefix + 'p', 0)
+        self.baseline = 0.0
+        self.samples = []
+
+    @asyncio.coroutine
+    def measure(self, count):
+        results = []
+        for _ in range(count):
+            latency = yield from self.timed('time')
+            if latency is not None:
+                results.append(latency)
+            yield from asyncio.sleep(1.0 / merc.PULSE_PER_SECOND)
+        return results
+
+    @asyncio.coroutine
+    def run_probe(self, ready, done):
+        self.reader, self.writer = yield from asyncio.open_connection(self.args.host, self.args.port)
+        reading = asyncio.ensure_future(self.read_loop())
+        try:
+            yield from asyncio.sleep(0.5)
+            yield from self.send(self.name)
+            yield from asyncio.wait_for(self.playing.wait(), self.args.login_timeout)
+            yield from self.send('')
+            baseline = yield from self.measure(20)
+            self.baseline = percentile(baseline, 50)
+            ready.set()
+            while not done.is_set():
+                self.samples.extend((yield from self.measure(4)))
+        except asyncio.TimeoutError:
+            logger.warning('Probe got stuck logging in at: %r', self.text[-80:])
+        except ConnectionError as err:
+            logger.warning('Probe lost its connection: %s', err)
+        finally:
+            ready.set()
+            reading.cancel()
+            self.writer.close()
+
+
+@asyncio.coroutine
+def swarm(args):
+    stats = Stats()
+    ready = asyncio.Event()
+    done = asyncio.Event()
+    probe = Probe(args)
+    probing = asyncio.ensure_future(probe.run_probe(ready, done))
+    yield from ready.wait()
+    stop_at = time.time() + args.duration + args.bots / args.rate
+    stats.started = time.time()
+
+    bots = []
+    for number in range(1, args.bots + 1):
+        bots.append(asyncio.ensure_future(Bot(args, number, stats).run(stop_at)))
+        yield from asyncio.sleep(1.0 / args.rate)
+    last_report = time.time()
+    while not all(bot.done() for bot in bots):
+        yield from asyncio.sleep(1)
+        if time.time() - last_report >= args.interval:
+            last_report = time.time()
+            print(stats.report(probe) + '\n')
+    done.set()
+    yield from probing
+    print(stats.report(probe))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test a Pyom server with a swarm of telnet bots.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=settings.PORT)
+    parser.add_argument('--bots', type=int, default=100, help='number of connections')
+    parser.add_argument('--rate', type=float, default=50, help='new connections per second')
+    parser.add_argument('--duration', type=float, default=60, help='seconds to run once all bots are on')
+    parser.add_argument('--script', default='mixed', choices=sorted(SCRIPTS))
+    parser.add_argument('--think', type=float, default=2.0, help='mean seconds between a bot\'s commands')
+    parser.add_argument('--prefix', default='bot', help='bot names start with this, letters only')
+    parser.add_argument('--interval', type=float, default=10, help='seconds between progress reports')
+    parser.add_argument('--login-timeout', type=float, default=30)
+    parser.add_argument('--command-timeout', type=float, default=10)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+    logging.basicConfig(format='%(asctime)s %(levelname)-8s %(message)s', level=logging.WARNING)
+    random.seed(args.seed)
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_until_complete(swarm(args))
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -24,3 +24,4 @@
 #------------------------------------------------------------------------------
 
 from miniboa.async import TelnetServer
+## AsyncTelnetServer lives in miniboa.aio; import it from there only when it is wanted.
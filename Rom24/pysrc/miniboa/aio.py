@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*- line endings: unix -*-
+# ------------------------------------------------------------------------------
+#   miniboa/aio.py
+#   Copyright 2009 Jim Storch
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain a
+#   copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#------------------------------------------------------------------------------
+
+"""
+Handle Telnet Connections from inside an asyncio event loop.
+
+This is an alternative to the polling TelnetServer.  Instead of the game
+calling poll() in a loop, the event loop calls us whenever a socket has
+data, and output is flushed on the next pass of the loop after it is
+queued.
+"""
+
+import asyncio
+import logging
+
+logger = logging.getLogger()
+
+from miniboa.telnet import TelnetClient
+
+
+#--[ Telnet Client ]-----------------------------------------------------------
+
+class AsyncTelnetClient(TelnetClient):
+    """
+    A TelnetClient whose output goes through an asyncio transport rather
+    than straight to the socket.
+    """
+
+    def __init__(self, transport):
+        super().__init__(transport.get_extra_info('socket'),
+                         transport.get_extra_info('peername'))
+        self.transport = transport
+        self.writing_paused = False  # The transport's buffer is full
+
+    def socket_send(self):
+        """
+        Called by AsyncTelnetServer when send data is ready.  The transport
+        buffers anything the socket won't take, so this drains us unless
+        the transport has asked us to stop, in which case the output stays
+        in our queue where the overflow policy can see it.
+        """
+        self._sync_compress2()
+        while not self.writing_paused:
+            self._refill_from_spool()
+            if not self.send_buffer:
+                break
+            self.transport.writelines(self.send_buffer)
+            self.bytes_sent += self.send_buffer_size
+            self.send_buffer.clear()
+            self.send_buffer_size = 0
+        self.send_backlogged = self.writing_paused and self.queue_depth() > 0
+        if not self.send_backlogged:
+            self.send_pending = False
+
+
+class _TelnetProtocol(asyncio.Protocol):
+    """
+    Glue between the event loop and a single AsyncTelnetClient.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.client = None
+
+    def connection_made(self, transport):
+        self.client = self.server._connection_made(transport)
+
+    def data_received(self, data):
+        if self.client is None or not self.client.active:
+            return
+        self.client.receive(data)
+        if self.client.cmd_ready:
+            self.server._schedule_input(self.client)
+
+    def pause_writing(self):
+        if self.client is not None:
+            self.client.writing_paused = True
+
+    def resume_writing(self):
+        if self.client is not None:
+            self.client.writing_paused = False
+            self.server._flush(self.client)
+
+    def connection_lost(self, exc):
+        if self.client is not None:
+            logger.debug("Connection lost from %s", self.client.addrport())
+            self.client.deactivate()
+
+
+#--[ Telnet Server ]-----------------------------------------------------------
+
+## Default connection handler
+def _on_connect(client):
+    """
+    Placeholder new connection handler.
+    """
+    logger.info("++ Opened connection to {}, sending greeting...".format(client.addrport()))
+    client.send("Greetings from Miniboa-py3!\n")
+
+
+## Default disconnection handler
+def _on_disconnect(client):
+    """
+    Placeholder lost connection handler.
+    """
+    logger.info("-- Lost connection to {}".format(client.addrport()))
+
+
+## Default input handler
+def _on_input(client):
+    """
+    Placeholder input handler.
+    """
+    client.get_command()
+
+
+class AsyncTelnetServer(object):
+    """
+    Accept connections and move data for clients from an asyncio event loop.
+    """
+
+    def __init__(self, port=23, address='', on_connect=_on_connect,
+                 on_disconnect=_on_disconnect, on_input=_on_input,
+                 max_connections=None, timeout=0.05, loop=None, auto_flush=True):
+        """
+        Create a new asyncio Telnet Server.  Call start() from inside the
+        event loop to begin listening.
+
+        port -- Port to listen for new connection on.
+
+        address -- Address of the LOCAL network interface to listen on.
+
+        on_connect -- function to call with new telnet connections
+
+        on_disconnect -- function to call when a client's connection dies,
+            either through a terminated session or client.active being set
+            to False.
+
+        on_input -- function to call with a client as soon as it has a
+            complete line of input.  It should consume one command; if more
+            remain it will be called again after timeout.
+
+        max_connections -- maximum simultaneous the server will accept at
+            once, or None for no limit.
+
+        timeout -- how long to wait before handing the next queued command
+            from the same client to on_input.
+
+        loop -- the event loop to run in.  Defaults to the current one.
+
+        auto_flush -- if True, output is written on the next pass of the
+            loop after it is queued.  If False, the application flushes each
+            client by calling its socket_send().
+        """
+
+        self.port = port
+        self.address = address
+        self.on_connect = on_connect
+        self.on_disconnect = on_disconnect
+        self.on_input = on_input
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.auto_flush = auto_flush
+        self.loop = loop or asyncio.get_event_loop()
+        self.server = None
+
+        ## Dictionary of active clients,
+        ## key = file descriptor, value = AsyncTelnetClient instance
+        self.clients = {}
+
+        ## Clients that already have an on_input call queued
+        self.input_scheduled = set()
+
+    @asyncio.coroutine
+    def start(self):
+        """
+        Start listening for connections.
+        """
+        try:
+            self.server = yield from self.loop.create_server(lambda: _TelnetProtocol(self),
+                                                             self.address or None, self.port,
+                                                             reuse_address=True)
+        except OSError as err:
+            logger.critical("Unable to create the server socket: " + str(err))
+            raise
+
+    def stop(self):
+        """
+        Disconnects the clients and shuts down the server
+        """
+        for client in list(self.client_list()):
+            client.transport.close()
+        if self.server is not None:
+            self.server.close()
+
+    def client_count(self):
+        """
+        Returns the number of active connections.
+        """
+        return len(self.clients)
+
+    def client_list(self):
+        """
+        Returns a list of connected clients.
+        """
+        return self.clients.values()
+
+    def _connection_made(self, transport):
+        """
+        Build a client for a freshly accepted transport, or refuse it.
+        """
+        if self.max_connections is not None and self.client_count() >= self.max_connections:
+            logger.warning("Refusing new connection, maximum already in use.")
+            transport.close()
+            return None
+
+        client = AsyncTelnetClient(transport)
+        self.clients[client.fileno] = client
+        client.on_send_pending = self._on_send_pending
+        client.on_deactivate = self._on_deactivate
+        self.on_connect(client)
+        if client.send_pending:
+            self._on_send_pending(client)
+        return client
+
+    def _on_send_pending(self, client):
+        """
+        Flush a client on the next pass of the loop once it has output,
+        so everything queued in the meantime goes out together.
+        """
+        if self.auto_flush and client.send_pending:
+            self.loop.call_soon(self._flush, client)
+
+    def _flush(self, client):
+        if client.active and client.send_pending:
+            client.socket_send()
+
+    def _on_deactivate(self, client):
+        self.loop.call_soon(self._remove_client, client)
+
+    def _remove_client(self, client):
+        """
+        Forget a dead client, call the disconnection handler and
+        close its transport.
+        """
+        if self.clients.get(client.fileno, None) is not client:
+            return
+        del self.clients[client.fileno]
+        self.input_scheduled.discard(client)
+        self.on_disconnect(client)
+        client.on_send_pending = None
+        client.on_deactivate = None
+        client.transport.close()
+
+    def _schedule_input(self, client):
+        """
+        Hand a client's first queued command to on_input right away.
+        """
+        if client not in self.input_scheduled:
+            self.input_scheduled.add(client)
+            self.loop.call_soon(self._dispatch_input, client)
+
+    def _dispatch_input(self, client):
+        self.input_scheduled.discard(client)
+        if not client.active or not client.cmd_ready:
+            return
+        self.on_input(client)
+        ## One command per slice, so a flood can't starve everyone else.
+        if client.active and client.cmd_ready:
+            self.input_scheduled.add(client)
+            self.loop.call_later(self.timeout, self._dispatch_input, client)
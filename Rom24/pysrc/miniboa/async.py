@@ -28,7 +28,7 @@ Handle Asynchronous Telnet Connections.
 """
 
 import socket
-import select
+import selectors
 import sys
 import logging
 
@@ -38,12 +38,14 @@ from miniboa.telnet import TelnetClient
 from miniboa.telnet import ConnectionLost
 
 
-## Cap sockets to 512 on Windows because winsock can only process 512 at time
+## select() can only watch 512 sockets on Windows, and cannot see file
+## descriptors above 1024 on Linux.  The other selectors (epoll, kqueue,
+## devpoll, poll) have no such limit, so this cap only applies to the
+## SelectSelector backend.
 if sys.platform == 'win32':
-    MAX_CONNECTIONS = 500
-## Cap sockets to 1000 on Linux because you can only have 1024 file descriptors
+    SELECT_MAX_CONNECTIONS = 500
 else:
-    MAX_CONNECTIONS = 1000
+    SELECT_MAX_CONNECTIONS = 1000
 
 #--[ Telnet Server ]-----------------------------------------------------------
 
@@ -71,8 +73,8 @@ class TelnetServer(object):
     """
 
     def __init__(self, port=23, address='', on_connect=_on_connect,
-                 on_disconnect=_on_disconnect, max_connections=MAX_CONNECTIONS,
-                 timeout=0.05):
+                 on_disconnect=_on_disconnect, max_connections=None,
+                 timeout=0.05, selector=None, auto_flush=True):
         """
         Create a new Telnet Server.
 
@@ -90,18 +92,39 @@ class TelnetServer(object):
             either through a terminated session or client.active being set
             to False.
 
-        max_connections -- maximum simultaneous the server will accept at once
+        max_connections -- maximum simultaneous the server will accept at
+            once.  None means no limit, other than the one imposed by the
+            select() backend.
 
         timeout -- amount of time that Poll() will wait from user input
             before returning.  Also frees a slice of CPU time.
+
+        selector -- a selectors.BaseSelector instance used to wait for
+            socket events.  Defaults to selectors.DefaultSelector, which is
+            epoll on Linux and kqueue on the BSDs.
+
+        auto_flush -- if True, output is written as soon as the socket is
+            writable.  If False, the application flushes each client by
+            calling its socket_send(), and poll() only finishes writes the
+            socket could not take in one go.
         """
 
         self.port = port
         self.address = address
         self.on_connect = on_connect
         self.on_disconnect = on_disconnect
-        self.max_connections = min(max_connections, MAX_CONNECTIONS)
         self.timeout = timeout
+        self.auto_flush = auto_flush
+
+        if selector is None:
+            selector = selectors.DefaultSelector()
+        self.selector = selector
+
+        if isinstance(selector, selectors.SelectSelector):
+            if max_connections is None:
+                max_connections = SELECT_MAX_CONNECTIONS
+            max_connections = min(max_connections, SELECT_MAX_CONNECTIONS)
+        self.max_connections = max_connections
 
         server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -115,17 +138,22 @@ class TelnetServer(object):
 
         self.server_socket = server_socket
         self.server_fileno = server_socket.fileno()
+        self.selector.register(self.server_fileno, selectors.EVENT_READ)
 
         ## Dictionary of active clients,
         ## key = file descriptor, value = TelnetClient instance
         self.clients = {}
 
+        ## File descriptors of clients that went inactive since the last poll
+        self.dead_clients = set()
+
     def stop(self):
         """
         Disconnects the clients and shuts down the server
         """
         for clients in self.client_list():
             clients.sock.close()
+        self.selector.close()
         self.server_socket.close()
         ## TODO: Anything else need doing?
 
@@ -141,6 +169,54 @@ class TelnetServer(object):
         """
         return self.clients.values()
 
+    def _on_send_pending(self, client):
+        """
+        Called by a client whenever its send_pending or send_backlogged
+        flag changes, so write interest is only toggled when there is
+        something for poll() to send.
+        """
+        if client.fileno not in self.clients or not client.active:
+            return
+        events = selectors.EVENT_READ
+        if client.send_pending and (self.auto_flush or client.send_backlogged):
+            events |= selectors.EVENT_WRITE
+        if self.selector.get_key(client.fileno).events != events:
+            self.selector.modify(client.fileno, events)
+
+    def _on_deactivate(self, client):
+        """
+        Called by a client when it is marked inactive, so the next poll
+        can clean it up without scanning every connection.
+        """
+        if client.fileno in self.clients:
+            self.dead_clients.add(client.fileno)
+
+    def _add_client(self, client):
+        """
+        Register a new client with the selector and wire up its
+        state change notifications.
+        """
+        self.clients[client.fileno] = client
+        self.selector.register(client.fileno, selectors.EVENT_READ)
+        client.on_send_pending = self._on_send_pending
+        client.on_deactivate = self._on_deactivate
+        if client.send_pending:
+            self._on_send_pending(client)
+
+    def _remove_client(self, fileno):
+        """
+        Unregister a dead client, call the disconnection handler and
+        close its socket.
+        """
+        client = self.clients.pop(fileno, None)
+        if client is None:
+            return
+        self.selector.unregister(fileno)
+        self.on_disconnect(client)
+        client.on_send_pending = None
+        client.on_deactivate = None
+        client.sock.close()
+
     def poll(self):
         """
         Perform a non-blocking scan of recv and send states on the server
@@ -148,40 +224,21 @@ class TelnetServer(object):
         read incomming data, and send outgoing data.  Sends and receives may
         be partial.
         """
-        ## Build a list of connections to test for receive data pending
-        recv_list = [self.server_fileno]  # always add the server
-
-        del_list = []  # list of clients to delete after polling
-
-        for client in self.clients.values():
-            if client.active:
-                recv_list.append(client.fileno)
-            else:
-                self.on_disconnect(client)
-                del_list.append(client.fileno)
-                client.sock.close()
-
         ## Delete inactive connections from the dictionary
-        for client in del_list:
-            del self.clients[client]
+        while self.dead_clients:
+            self._remove_client(self.dead_clients.pop())
 
-        ## Build a list of connections that need to send data
-        send_list = []
-        for client in self.clients.values():
-            if client.send_pending:
-                send_list.append(client.fileno)
-
-        ## Get active socket file descriptors from select.select()
+        ## Get active socket file descriptors from the selector
         try:
-            rlist, slist, elist = select.select(recv_list, send_list, [],
-                                                self.timeout)
-        except select.error as err:
+            events = self.selector.select(self.timeout)
+        except OSError as err:
             ## If we can't even use select(), game over man, game over
             logger.critical("SELECT socket error '{}'".format(str(err)))
             raise
 
         ## Process socket file descriptors with data to receive
-        for sock_fileno in rlist:
+        for key, mask in events:
+            sock_fileno = key.fd
 
             ## If it's coming from the server's socket then this is a new
             ## connection request.
@@ -190,30 +247,44 @@ class TelnetServer(object):
                 try:
                     sock, addr_tup = self.server_socket.accept()
                 except socket.error as err:
-                    logger.error("ACCEPT socket error '{}:{}'.".format(err[0], err[1]))
+                    logger.error("ACCEPT socket error '{}'.".format(err))
                     continue
 
                 #Check for maximum connections
-                if self.client_count() >= self.max_connections:
+                if self.max_connections is not None and self.client_count() >= self.max_connections:
                     logger.warning("Refusing new connection, maximum already in use.")
                     sock.close()
                     continue
 
+                ## Writes must never stall the game, and since output is
+                ## already coalesced, Nagle would only delay it
+                sock.setblocking(False)
+                try:
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                except socket.error:
+                    pass
+
                 ## Create the client instance
                 new_client = TelnetClient(sock, addr_tup)
 
                 ## Add the connection to our dictionary and call handler
-                self.clients[new_client.fileno] = new_client
+                self._add_client(new_client)
                 self.on_connect(new_client)
+                continue
 
-            else:
+            client = self.clients.get(sock_fileno, None)
+            if client is None or not client.active:
+                continue
+
+            if mask & selectors.EVENT_READ:
                 ## Call the connection's recieve method
                 try:
-                    self.clients[sock_fileno].socket_recv()
+                    client.socket_recv()
                 except ConnectionLost:
-                    self.clients[sock_fileno].deactivate()
+                    client.deactivate()
+                    continue
 
-        ## Process sockets with data to send
-        for sock_fileno in slist:
-            ## Call the connection's send method
-            self.clients[sock_fileno].socket_send()
+            ## Process sockets with data to send
+            if mask & selectors.EVENT_WRITE and client.active:
+                ## Call the connection's send method
+                client.socket_send()
@@ -27,10 +27,13 @@
 Manage one Telnet client connected via a TCP/IP socket.
 """
 
-import sys
 import socket
+import tempfile
 import time
+import zlib
 import logging
+from collections import deque
+from itertools import islice
 
 logger = logging.getLogger()
 
@@ -77,9 +80,17 @@ from miniboa.terminal import word_wrap
 
 #--[ Global Constants ]--------------------------------------------------------
 UNKNOWN = -1
-## Cap sockets to 500 on Windows because winsock can only process 512 at time
-## Cap sockets to 1000 on Linux because you can only have 1024 file descriptors
-MAX_CONNECTIONS = 500 if sys.platform == 'win32' else 1000
+## Most output chunks handed to the kernel in a single sendmsg() call
+SENDMSG_MAX_CHUNKS = 64
+_HAS_SENDMSG = hasattr(socket.socket, 'sendmsg')
+_HAS_CORK = hasattr(socket, 'TCP_CORK')
+
+## What to do with output once a client's queue passes its send_hard_limit
+OVERFLOW_DROP = 'drop'  # Discard it
+OVERFLOW_SPOOL = 'spool'  # Queue it in a temporary file until the client catches up
+OVERFLOW_DISCONNECT = 'disconnect'  # Give up on the client
+## How much spooled output is read back into memory at a time
+SPOOL_READ_SIZE = 64 * 1024
 
 #--[ Telnet Commands ]---------------------------------------------------------
 SE = chr(240)  # End of subnegotiation parameters
@@ -98,6 +109,7 @@ WONT = chr(252)  # Wont; deny option request
 DO = chr(253)  # Do = Request or confirm remote option
 DONT = chr(254)  # Don't = Demand or confirm option halt
 IAC = chr(255)  # Interpret as Command
+IAC_BYTE = b'\xff'  # IAC as it appears on the wire
 SEND = chr(1)  # Sub-process negotiation SEND command
 IS = chr(0)  # Sub-process negotiation IS command
 
@@ -109,6 +121,7 @@ SGA = chr(3)  # Suppress Go-Ahead
 TTYPE = chr(24)  # Terminal Type
 NAWS = chr(31)  # Negotiate About Window Size
 LINEMO = chr(34)  # Line Mode
+COMPRESS2 = chr(86)  # MUD Client Compression Protocol v2
 
 
 #--[ Connection Lost ]---------------------------------------------------------
@@ -140,6 +153,12 @@ class TelnetClient(object):
     """
 
     def __init__(self, sock, addr_tup):
+        ## Hooks the TelnetServer uses to follow changes in our state
+        self.on_send_pending = None  # Called when send_pending or send_backlogged changes
+        self.on_deactivate = None  # Called when active turns False
+        self._send_pending = False
+        self._send_backlogged = False
+        self._active = True
         self.protocol = 'telnet'
         self.active = True  # Turns False when the connection is lost
         self.sock = sock  # The connection's socket
@@ -151,12 +170,27 @@ class TelnetClient(object):
         self.columns = 80
         self.rows = 24
         self.send_pending = False
-        self.send_buffer = ''
+        self.send_buffer = deque()  # Queue of cp1252 encoded output chunks
+        self.send_buffer_size = 0  # Bytes waiting in send_buffer
+        self.new_output = False  # Output queued since the owner last looked
+
+        ## Output flow control for slow clients, see _queue_output()
+        self.send_high_water = None  # Past this many bytes, droppable output is discarded
+        self.send_hard_limit = None  # Past this many bytes, overflow_policy applies
+        self.overflow_policy = OVERFLOW_DISCONNECT
+        self.spool_limit = None  # Most bytes that may be spooled before we give up
+        self.spool = None  # Temporary file, while output is being spooled
+        self.spool_size = 0  # Bytes waiting in the spool
+        self.spool_read_pos = 0
+        self.send_queue_peak = 0  # Deepest the output queue has been
+        self.dropped_messages = 0  # Messages thrown away by flow control
         self.recv_buffer = ''
         self.bytes_sent = 0
         self.bytes_received = 0
         self.cmd_ready = False
-        self.command_list = []
+        self.command_list = deque()
+        self.max_commands = None  # Most lines that may wait in command_list
+        self.dropped_commands = 0  # Lines thrown away because command_list was full
         self.connect_time = time.time()
         self.last_input_time = time.time()
 
@@ -169,6 +203,12 @@ class TelnetClient(object):
         self.telnet_echo_password = False  # Echo back '*' for passwords?
         self.telnet_sb_buffer = ''  # Buffer for sub-negotiations
 
+        ## MCCP2 state, see request_will_compress2()
+        self.compressor = None  # zlib stream, once compression has started
+        self.compress_dirty = False  # Data went in since the last sync flush?
+        self.compress_bytes_in = 0  # Raw bytes fed to the compressor
+        self.compress_bytes_out = 0  # Compressed bytes it gave back
+
     def get_command(self):
         """
         Get a line of text that was received from the client. The class's
@@ -177,18 +217,66 @@ class TelnetClient(object):
         cmd = None
         count = len(self.command_list)
         if count > 0:
-            cmd = self.command_list.pop(0)
+            cmd = self.command_list.popleft()
 
         ## If that was the last line, turn off lines_pending
         if count == 1:
             self.cmd_ready = False
         return cmd
 
-    def send(self, text: str, wrap: int=None, terminal: str='ansi'):
-        """
-        Send raw text to the distant end.
+    @property
+    def active(self):
+        return self._active
+
+    @active.setter
+    def active(self, value):
+        value = bool(value)
+        if value == self._active:
+            return
+        self._active = value
+        if not value and self.on_deactivate:
+            self.on_deactivate(self)
+
+    @property
+    def send_pending(self):
+        return self._send_pending
+
+    @send_pending.setter
+    def send_pending(self, value):
+        value = bool(value)
+        if value == self._send_pending:
+            return
+        self._send_pending = value
+        if self.on_send_pending:
+            self.on_send_pending(self)
+
+    @property
+    def send_backlogged(self):
+        """
+        True when a flush left output the socket would not take yet.
+        """
+        return self._send_backlogged
+
+    @send_backlogged.setter
+    def send_backlogged(self, value):
+        value = bool(value)
+        if value == self._send_backlogged:
+            return
+        self._send_backlogged = value
+        if self.on_send_pending:
+            self.on_send_pending(self)
+
+    def send(self, text: str, wrap: int=None, terminal: str='ansi', droppable: bool=False):
+        """
+        Send raw text to the distant end.  Droppable text (channels, things
+        happening to other people) is discarded if the client has more than
+        send_high_water bytes waiting already.
         """
         if text and isinstance(text, str):
+            if droppable and self.send_high_water is not None \
+                    and self.queue_depth() >= self.send_high_water:
+                self.dropped_messages += 1
+                return
             text = text.replace('\n\r', '\n')  # DikuMUD got their line endings backwards
             text = text.replace('\r\n', '\n')  # This is correct for TELNET, but we need to ensure
             # that "\r\n" doesn't become "\r\n\n" later.
@@ -196,9 +284,144 @@ class TelnetClient(object):
                 text = '\n'.join(word_wrap(text, wrap))  # Note self.columns is negotiated
             if terminal:
                 text = color_convert(text, 'pyom', terminal)  # Note self.terminal_type is negotiated
-            self.send_buffer += text.replace('\n', '\r\n')
+            self._queue_output(text.replace('\n', '\r\n'))
+
+    def _queue_output(self, text: str):
+        """
+        Encode text once, as it is queued, rather than on every send attempt.
+        """
+        #convert to ansi before sending
+        data = bytes(text, "cp1252")
+        if data:
+            if not self._check_overflow(len(data)):
+                return
+            if self.compressor:
+                self.compress_bytes_in += len(data)
+                self.compress_dirty = True
+                data = self.compressor.compress(data)
+                self._queue_compressed(data)
+            else:
+                self._append_chunk(data)
+            self.new_output = True
             self.send_pending = True
 
+    def _queue_compressed(self, data: bytes):
+        if data:
+            self.compress_bytes_out += len(data)
+            self._append_chunk(data)
+
+    def _append_chunk(self, data: bytes):
+        """
+        Add encoded output to the end of the queue, which is the spool
+        file instead of memory while there is anything spooled.
+        """
+        if self.spool:
+            self.spool.seek(0, 2)
+            self.spool.write(data)
+            self.spool_size += len(data)
+        else:
+            self.send_buffer.append(data)
+            self.send_buffer_size += len(data)
+        self.send_queue_peak = max(self.send_queue_peak, self.queue_depth())
+
+    def _check_overflow(self, size: int):
+        """
+        Apply the overflow policy if the queue is past send_hard_limit.
+        Returns False if the output should be thrown away.
+        """
+        if self.spool is None and (self.send_hard_limit is None
+                                   or self.send_buffer_size + size <= self.send_hard_limit):
+            return True
+        if self.overflow_policy == OVERFLOW_DROP:
+            self.dropped_messages += 1
+            return False
+        if self.overflow_policy == OVERFLOW_SPOOL:
+            if self.spool_limit is None or self.spool_size + size <= self.spool_limit:
+                if self.spool is None:
+                    logger.warning("Spooling output for {}, {} bytes queued".format(
+                        self.addrport(), self.send_buffer_size))
+                    self.spool = tempfile.TemporaryFile()
+                    self.spool_read_pos = 0
+                return True
+        logger.warning("Disconnecting {}, {} bytes of output queued".format(self.addrport(), self.queue_depth()))
+        self.deactivate()
+        return False
+
+    def _refill_from_spool(self):
+        """
+        Move spooled output back into memory as the client drains it.  The
+        spool stays in use until everything queued has been sent, so output
+        near the hard limit doesn't flap in and out of it.
+        """
+        if not self.spool or self.send_buffer:
+            return
+        if not self.spool_size:
+            self.spool.close()
+            self.spool = None
+            logger.info("Spool for {} drained".format(self.addrport()))
+            return
+        self.spool.seek(self.spool_read_pos)
+        data = self.spool.read(min(SPOOL_READ_SIZE, self.send_hard_limit or SPOOL_READ_SIZE))
+        self.spool_read_pos += len(data)
+        self.spool_size -= len(data)
+        self.send_buffer.append(data)
+        self.send_buffer_size += len(data)
+        if not self.spool_size:
+            ## Start over at the top of the file
+            self.spool.seek(0)
+            self.spool.truncate()
+            self.spool_read_pos = 0
+
+    def queue_depth(self):
+        """
+        Returns the number of bytes of output waiting, in memory or spooled.
+        """
+        return self.send_buffer_size + self.spool_size
+
+    def _start_compress2(self):
+        """
+        Tell the client everything after this point is compressed, and
+        start compressing.  See http://www.zuggsoft.com/zmud/mcp.htm
+        """
+        if self.compressor or not self.active:
+            return
+        ## The marker skips the overflow policy: if it were dropped, the client
+        ## would get zlib data it was never told to expect.
+        self._append_chunk(bytes("{}{}{}{}{}".format(IAC, SB, COMPRESS2, IAC, SE), "cp1252"))
+        self.send_pending = True
+        self.compressor = zlib.compressobj()
+        logger.info("MCCP2 compression started for {}".format(self.addrport()))
+
+    def _stop_compress2(self):
+        """
+        End the compressed stream; output after this goes out raw again.
+        """
+        if not self.compressor:
+            return
+        self._queue_compressed(self.compressor.flush(zlib.Z_FINISH))
+        self.compressor = None
+        self.compress_dirty = False
+        self.send_pending = True
+
+    def _sync_compress2(self):
+        """
+        Push whatever the compressor is holding into the output queue, so
+        the client can decompress everything queued so far.  Done once per
+        flush, rather than once per message, to keep the ratio up.
+        """
+        if self.compressor and self.compress_dirty:
+            self._queue_compressed(self.compressor.flush(zlib.Z_SYNC_FLUSH))
+            self.compress_dirty = False
+
+    def compress_ratio(self):
+        """
+        Returns raw bytes per compressed byte sent, or None if MCCP2 has
+        not compressed anything.
+        """
+        if not self.compress_bytes_out:
+            return None
+        return self.compress_bytes_in / self.compress_bytes_out
+
     #def send_cc(self, text):
     #    """
     #    Send text with caret codes converted to ansi.
@@ -218,6 +441,10 @@ class TelnetClient(object):
         Set the client to disconnect on the next server poll.
         """
         self.active = False
+        if self.spool:
+            self.spool.close()
+            self.spool = None
+            self.spool_size = 0
 
     def addrport(self):
         """
@@ -293,57 +520,138 @@ class TelnetClient(object):
 
     def socket_send(self):
         """
-        Called by TelnetServer when send data is ready.
+        Called by TelnetServer when send data is ready, or by the owner of
+        the connection to flush what it has queued.  Writes as much as the
+        socket will take, normally in a single system call.
         """
-        if len(self.send_buffer):
+        self._sync_compress2()
+        ## Only cork if this will take more than one call
+        corked = _HAS_CORK and len(self.send_buffer) > SENDMSG_MAX_CHUNKS
+        if corked:
+            self._set_cork(True)
+        while True:
+            self._refill_from_spool()
+            if not self.send_buffer:
+                break
             try:
-                #convert to ansi before sending
-                sent = self.sock.send(bytes(self.send_buffer, "cp1252"))
+                if _HAS_SENDMSG and len(self.send_buffer) > 1:
+                    ## Scatter-gather the queued chunks in one system call
+                    chunks = list(islice(self.send_buffer, SENDMSG_MAX_CHUNKS))
+                    sent = self.sock.sendmsg(chunks)
+                else:
+                    chunks = [self.send_buffer[0]]
+                    sent = self.sock.send(chunks[0])
+            except BlockingIOError:
+                break
             except socket.error as err:
                 logger.error("SEND error '{}' from {}".format(err, self.addrport()))
                 self.active = False
                 return
             self.bytes_sent += sent
-            self.send_buffer = self.send_buffer[sent:]
-        else:
+            self._drop_sent(sent)
+            if sent < sum(len(chunk) for chunk in chunks):
+                ## The socket is full, wait until it drains
+                break
+        if corked:
+            self._set_cork(False)
+        self.send_backlogged = bool(self.send_buffer)
+        if not self.send_buffer:
             self.send_pending = False
 
+    def _set_cork(self, state: bool):
+        try:
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1 if state else 0)
+        except socket.error:
+            pass
+
+    def _drop_sent(self, sent: int):
+        """
+        Remove sent bytes from the front of the output queue.  A partially
+        sent chunk is replaced by a view of its remainder, not a copy.
+        """
+        self.send_buffer_size -= sent
+        while sent:
+            chunk = self.send_buffer[0]
+            if len(chunk) <= sent:
+                sent -= len(chunk)
+                self.send_buffer.popleft()
+            else:
+                self.send_buffer[0] = memoryview(chunk)[sent:]
+                sent = 0
+
+    def request_will_compress2(self):
+        """
+        Offer to compress our output with MCCP2 (telnet option 86).
+        """
+        self._iac_will(COMPRESS2)
+        self._note_reply_pending(COMPRESS2, True)
+
     def socket_recv(self):
         """
         Called by TelnetServer when recv data is ready.
         """
         try:
-            #Encode recieved bytes in ansi
-            data = str(self.sock.recv(2048), "cp1252")
+            data = self.sock.recv(2048)
+        except BlockingIOError:
+            return
         except socket.error as err:
             logger.error("RECIEVE socket error '{}' from {}".format(err, self.addrport()))
             raise ConnectionLost()
 
         ## Did they close the connection?
-        size = len(data)
-        if size == 0:
+        if len(data) == 0:
             logger.debug("No data recieved, client closed connection")
             raise ConnectionLost()
 
+        self.receive(data)
+
+    def receive(self, data: bytes):
+        """
+        Process a chunk of bytes read from the client, whichever server
+        happened to read it.  Runs of plain text are copied in bulk, and
+        only the bytes of IAC sequences go through _iac_sniffer().
+        """
+        size = len(data)
+
         ## Update some trackers
         self.last_input_time = time.time()
         self.bytes_received += size
 
         ## Test for telnet commands
-        for byte in data:
-            self._iac_sniffer(byte)
-
-        ## Look for newline characters to get whole lines from the buffer
-        while True:
-            mark = self.recv_buffer.find('\n')
+        start = 0
+        while start < size:
+            if self.telnet_got_iac or self.telnet_got_sb:
+                ## Inside a sequence, the state machine gets it byte by byte
+                #Encode recieved bytes in ansi
+                self._iac_sniffer(str(data[start:start + 1], "cp1252"))
+                start += 1
+                continue
+            mark = data.find(IAC_BYTE, start)
             if mark == -1:
-                break
-            cmd = self.recv_buffer[:mark].strip()
-            self.command_list.append(cmd)
-            self.cmd_ready = True
-            self.recv_buffer = self.recv_buffer[mark + 1:]
-
-    def _recv_byte(self, byte):
+                mark = size
+            if mark > start:
+                #Encode recieved bytes in ansi
+                self._recv_text(str(data[start:mark], "cp1252"))
+            if mark < size:
+                self._iac_sniffer(IAC)
+            start = mark + 1
+
+        ## Split whole lines off the front of the buffer, keeping the partial
+        ## line (if any) at the end for next time
+        if '\n' in self.recv_buffer:
+            lines = self.recv_buffer.split('\n')
+            self.recv_buffer = lines.pop()
+            if self.max_commands is not None:
+                ## Anything past the limit is flood, drop it
+                room = max(0, self.max_commands - len(self.command_list))
+                if len(lines) > room:
+                    self.dropped_commands += len(lines) - room
+                    del lines[room:]
+            if lines:
+                self.command_list.extend(line.strip() for line in lines)
+                self.cmd_ready = True
+
+    def _recv_text(self, text):
         """
         Non-printable filtering currently disabled because it did not play
         well with extended character sets.
@@ -351,25 +659,23 @@ class TelnetClient(object):
         ## Filter out non-printing characters
         #if (byte >= ' ' and byte <= '~') or byte == '\n':
         if self.telnet_echo:
-            self._echo_byte(byte)
-        self.recv_buffer += byte
+            self._echo_text(text)
+        self.recv_buffer += text
 
-    def _echo_byte(self, byte):
+    def _echo_text(self, text):
         """
-        Echo a character back to the client and convert LF into CR\LF.
+        Echo characters back to the client and convert LF into CR\LF.
         """
-        if byte == '\n':
-            self.send_buffer += '\r'
         if self.telnet_echo_password:
-            self.send_buffer += '*'
+            self._queue_output('\r*'.join('*' * len(part) for part in text.split('\n')))
         else:
-            self.send_buffer += byte
+            self._queue_output(text.replace('\n', '\r\n'))
 
     def _iac_sniffer(self, byte):
         """
         Watches incomming data for Telnet IAC sequences.
         Passes the data, if any, with the IAC commands stripped to
-        _recv_byte().
+        _recv_text().
         """
         ## Are we not currently in an IAC sequence coming from the client?
         if self.telnet_got_iac is False:
@@ -391,7 +697,7 @@ class TelnetClient(object):
 
             else:
                 ## Just a normal NVT character
-                self._recv_byte(byte)
+                self._recv_text(byte)
                 return
 
         ## Byte handling when already in an IAC sequence sent from the client
@@ -502,6 +808,18 @@ class TelnetClient(object):
                     if option == ECHO:
                         self.telnet_echo = True
 
+            elif option == COMPRESS2:
+
+                if self._check_reply_pending(option):
+                    self._note_reply_pending(option, False)
+                    self._note_local_option(option, True)
+                    self._start_compress2()
+
+                elif self._check_local_option(option) is False or self._check_local_option(option) is UNKNOWN:
+                    self._note_local_option(option, True)
+                    self._iac_will(option)
+                    self._start_compress2()
+
             else:
                 ## All other options = Default to refusing once
                 if self._check_local_option(option) is UNKNOWN:
@@ -521,6 +839,13 @@ class TelnetClient(object):
                     ## Just nod unless setting echo
                     if option == ECHO:
                         self.telnet_echo = False
+
+            elif option == COMPRESS2:
+                if self._check_reply_pending(option):
+                    self._note_reply_pending(option, False)
+                self._note_local_option(option, False)
+                self._stop_compress2()
+
             else:
                 ## All other options = Default to ignoring
                 pass
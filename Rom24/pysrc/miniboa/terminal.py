@@ -54,6 +54,7 @@ import logging
 logger = logging.getLogger()
 
 import re
+import functools
 
 from miniboa.colors import TERMINAL_TYPES, COLOR_MAP
 
@@ -96,6 +97,11 @@ def word_wrap(text: str, columns=80, indent=4, padding=2):
 
 class Xlator(dict):
     """ All-in-one multiple-string-substitution class """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.regex = self._make_regex()
+        self.otype = None
+
     def _make_regex(self):
         """ Build re object based on the keys of the current dictionary """
         #x = lambda s: '(?<!' + re.escape(s[0]) + ')' + re.escape(s)
@@ -108,7 +114,39 @@ class Xlator(dict):
     def xlat(self, text, otype):
         """ Translate text, returns the modified text. """
         self.otype = otype
-        return self._make_regex().sub(self, text)
+        return self.regex.sub(self, text)
+
+
+def _make_translator(regex, color_map, o):
+    """
+    Returns a function that swaps every token of color_map found in a
+    string for its code in column o of the ColorToken.
+    """
+    table = {k: v[o] for k, v in color_map.items()}
+    return lambda text: regex.sub(lambda match: table[match.group(0)], text)
+
+
+def _build_translators():
+    """
+    Compile a translator for every (input type, output type) pair up front,
+    rather than a new regex on every call to color_convert().  Pinkfish (i3)
+    tokens are split, not matched, so they have no translator.
+    """
+    translators = {}
+    for input_type, color_map in COLOR_MAP.items():
+        if input_type in ('unknown', 'i3') or not color_map:
+            continue
+        regex = Xlator(color_map).regex
+        for o, output_type in enumerate(TERMINAL_TYPES):
+            translators[(input_type, output_type)] = _make_translator(regex, color_map, o)
+    return translators
+
+_TRANSLATORS = _build_translators()
+
+## Rendered output is kept for short strings, which is where the repeats are:
+## prompts, room names, channel prefixes and single words from word_wrap().
+_RENDER_CACHE_SIZE = 4096
+_RENDER_CACHE_MAX_LENGTH = 256
 
 
 def color_convert(text: str or None, input_type='pyom', output_type='ansi'):
@@ -127,6 +165,12 @@ def color_convert(text: str or None, input_type='pyom', output_type='ansi'):
     if output_type is not None and output_type not in TERMINAL_TYPES:
         output_type = None
 
+    if len(text) <= _RENDER_CACHE_MAX_LENGTH:
+        return _cached_render(text, input_type, output_type)
+    return _render(text, input_type, output_type)
+
+
+def _render(text: str, input_type: str, output_type: str or None):
     if input_type == 'i3':
         words = text.split('%^')
         for word in words:
@@ -144,19 +188,9 @@ def color_convert(text: str or None, input_type='pyom', output_type='ansi'):
     else:
         if output_type is None:
             output_type = 'unknown'
-        o = TERMINAL_TYPES.index(output_type)
-        xl = Xlator(COLOR_MAP[input_type])
-        return xl.xlat(text, o)
-
-        # for k in COLOR_MAP[input_type].keys():
-        #     if output_type is None:
-        #         text = text.replace(k, '')
-        #     else:
-        #         o = TERMINAL_TYPES.index(output_type)
-        #         v = COLOR_MAP[input_type][k][o]
-        #         if k != v and v not in COLOR_MAP[input_type]:
-        #             text = text.replace(k, v)
-        # return text
+        return _TRANSLATORS[(input_type, output_type)](text)
+
+_cached_render = functools.lru_cache(maxsize=_RENDER_CACHE_SIZE)(_render)
 
 
 def escape(text: str, input_type='pyom'):
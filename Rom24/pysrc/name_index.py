@@ -0,0 +1,100 @@
+"""
+/***************************************************************************
+ *  Original Diku Mud copyright (C) 1990, 1991 by Sebastian Hammer,        *
+ *  Michael Seifert, Hans Henrik St{rfeldt, Tom Madsen, and Katja Nyboe.   *
+ *                                                                         *
+ *  Merc Diku Mud improvments copyright (C) 1992, 1993 by Michael          *
+ *  Chastain, Michael Quan, and Mitchell Tse.                              *
+ *                                                                         *
+ *  In order to use any part of this Merc Diku Mud, you must comply with   *
+ *  both the original Diku license in 'license.doc' as well the Merc       *
+ *  license in 'license.txt'.  In particular, you may not remove either of *
+ *  these copyright notices.                                               *
+ *                                                                         *
+ *  Much time and thought has gone into this software and you are          *
+ *  benefitting.  We hope that you share your changes too.  What goes      *
+ *  around, comes around.                                                  *
+ ***************************************************************************/
+
+/***************************************************************************
+*   ROM 2.4 is copyright 1993-1998 Russ Taylor                             *
+*   ROM has been brought to you by the ROM consortium                      *
+*       Russ Taylor (rtaylor@hypercube.org)                                *
+*       Gabrielle Taylor (gtaylor@hypercube.org)                           *
+*       Brian Moore (zump@rom.org)                                         *
+*   By using this code, you have agreed to follow the terms of the         *
+*   ROM license, in the file Rom24/doc/rom.license                         *
+***************************************************************************/
+/************
+ * Ported to Python by Davion of MudBytes.net
+ * Using Miniboa https://code.google.com/p/miniboa/
+ * Now using Python 3 version https://code.google.com/p/miniboa-py3/
+ ************/
+"""
+import bisect
+import logging
+
+logger = logging.getLogger()
+
+import game_utils
+
+# Keyword indexes for finding things anywhere in the world by name.
+#
+# Every word of every character's and item's name maps to the instance ids
+# that have it, and the words are also kept sorted, so everything with a
+# word starting with what was typed is found by a bisect and a short scan
+# rather than by running is_name over the whole world.  Entries are added
+# in instance_setup, dropped in instance_destructor, and anything renaming
+# a live instance goes through rename() to keep them right.
+
+
+class NameIndex:
+    def __init__(self):
+        self.ids_by_word = {}
+        self.words_by_id = {}
+        self.sorted_words = []
+
+    def add(self, instance_id, name):
+        self.remove(instance_id)
+        words = set(game_utils.name_words(name or ''))
+        self.words_by_id[instance_id] = words
+        for word in words:
+            if word not in self.ids_by_word:
+                self.ids_by_word[word] = set()
+                bisect.insort(self.sorted_words, word)
+            self.ids_by_word[word].add(instance_id)
+
+    def remove(self, instance_id):
+        for word in self.words_by_id.pop(instance_id, ()):
+            ids = self.ids_by_word[word]
+            ids.discard(instance_id)
+            if not ids:
+                del self.ids_by_word[word]
+                del self.sorted_words[bisect.bisect_left(self.sorted_words, word)]
+
+    def find(self, arg):
+        """
+        Instance ids with a name word starting with arg, lowest first,
+        which is the order is_name over the sorted instance dict gave.
+        """
+        if not arg:
+            return []
+        arg = arg.lower()
+        found = set()
+        for i in range(bisect.bisect_left(self.sorted_words, arg), len(self.sorted_words)):
+            word = self.sorted_words[i]
+            if not word.startswith(arg):
+                break
+            found |= self.ids_by_word[word]
+        return sorted(found)
+
+
+characters = NameIndex()
+items = NameIndex()
+
+
+def rename(thing, name):
+    thing.name = name
+    if thing.instance_id:
+        index = characters if thing.is_living else items
+        index.add(thing.instance_id, name)
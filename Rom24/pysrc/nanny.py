@@ -61,7 +61,7 @@ class CharDummy:
         self.stub = None
         self.failed_attempts = 0
 
-    def send(self, pstr):
+    def send(self, pstr, **kwargs):
         pass
 
 ch_selections = {}
@@ -569,7 +569,7 @@ def con_read_motd(self):
         #ch.prompt = "<%hhp %mm %vmv> "
         ch.do_outfit(ch_selections['weapon'])
         ch.put(object_creator.create_item(instance.item_templates[merc.OBJ_VNUM_MAP], 0))
-        school_id = instance.instances_by_room[merc.ROOM_VNUM_SCHOOL][0]
+        school_id = instance.instances_by_room.first_instance_of(merc.ROOM_VNUM_SCHOOL)
         school = instance.rooms[school_id]
         school.put(ch)
         ch.do_help("newbie info")
@@ -592,11 +592,11 @@ def con_read_motd(self):
         if room and ch._environment != room.instance_id:
             room.put(ch)
     elif ch.is_immortal() and not ch.level == 0:
-        to_instance_id = instance.instances_by_room[merc.ROOM_VNUM_CHAT][0]
+        to_instance_id = instance.instances_by_room.first_instance_of(merc.ROOM_VNUM_CHAT)
         to_instance = instance.rooms[to_instance_id]
         to_instance.put(ch)
     else:
-        to_instance_id = instance.instances_by_room[merc.ROOM_VNUM_TEMPLE][0]
+        to_instance_id = instance.instances_by_room.first_instance_of(merc.ROOM_VNUM_TEMPLE)
         to_instance = instance.rooms[to_instance_id]
         to_instance.put(ch)
 
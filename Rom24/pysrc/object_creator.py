@@ -7,6 +7,7 @@ import logging
 logger = logging.getLogger()
 
 import game_utils
+import name_index
 import handler_game
 import handler_item
 import handler_room
@@ -253,7 +254,7 @@ def clone_mobile(parent, clone):
         return
 
     # start fixing values */
-    clone.name = parent.name
+    name_index.rename(clone, parent.name)
     clone.version = parent.version
     clone.short_descr = parent.short_descr
     clone.long_descr = parent.long_descr
@@ -265,7 +266,7 @@ def clone_mobile(parent, clone):
     clone.level = parent.level
     clone.trust = 0
     clone.timer = parent.timer
-    clone.wait = parent.wait
+    state_checks.WAIT_STATE(clone, parent.wait)
     clone.hit = parent.hit
     clone.max_hit = parent.max_hit
     clone.mana = parent.mana
@@ -56,8 +56,8 @@ logging.basicConfig(format='%(asctime)s %(levelname)-8s %(module)16s| %(message)
 logger = logging.getLogger()
 
 from miniboa import TelnetServer
-from settings import PORT
-from comm import game_loop, init_descriptor, close_socket
+from settings import PORT, ASYNC_SERVER
+from comm import game_loop, init_descriptor, close_socket, process_async_input
 from hotfix import init_monitoring
 import time
 
@@ -67,13 +67,26 @@ startup_time = time.time()
 def Pyom():
     sys.path.append(os.getcwd())
     logger.boot('Logging system initialized.')
-    server = TelnetServer(port=PORT)
+    if ASYNC_SERVER:
+        import asyncio
+        from miniboa.aio import AsyncTelnetServer
+        from comm_aio import async_game_loop
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        server = AsyncTelnetServer(port=PORT, loop=loop, auto_flush=False)
+        server.on_input = process_async_input
+    else:
+        server = TelnetServer(port=PORT, auto_flush=False)
     server.on_connect = init_descriptor
     server.on_disconnect = close_socket
 
     init_monitoring()
     logger.boot('Entering Game Loop')
-    game_loop(server)
+    if ASYNC_SERVER:
+        loop.run_until_complete(async_game_loop(server))
+        loop.close()
+    else:
+        game_loop(server)
     logger.critical('System halted.')
 
 if __name__ == "__main__":
@@ -132,7 +132,7 @@ def fwrite_char(ch):
     if ch.in_room.vnum == ROOM_VNUM_LIMBO and ch.was_in_room:
         in_room = ch.was_in_room
     elif not ch.in_room:
-        in_room = instance.instances_by_room[ROOM_VNUM_TEMPLE][0]
+        in_room = instance.instances_by_room.first_instance_of(ROOM_VNUM_TEMPLE)
     else:
         in_room = ch.in_room
     chdict["Room"] = in_room.vnum
@@ -233,7 +233,7 @@ def fread_char(chdict, ch):
     ch.trust = chdict["Tru"]
     ch.played = chdict["Plyd"]
     ch.lines = chdict["Scro"]
-    room = instance.instances_by_room[chdict["Room"]][0]
+    room = instance.instances_by_room.first_instance_of(chdict["Room"])
     if not room:
         room = chdict["Room"]
     ch.environment = room
@@ -10,6 +10,32 @@ NEWLOCK = False
 ENCRYPT_PASSWORD = True
 LOGALL = False
 MAX_ITERATIONS = 300
+ASYNC_SERVER = False  # Run the game loop on asyncio instead of polling
+
+#Output flow control, per client, in bytes
+SEND_HIGH_WATER = 64 * 1024  # Drop channel and room chatter past this
+SEND_HARD_LIMIT = 512 * 1024  # Apply SEND_OVERFLOW_POLICY past this
+SEND_OVERFLOW_POLICY = 'spool'  # 'drop', 'spool' to a temp file, or 'disconnect'
+SEND_SPOOL_LIMIT = 8 * 1024 * 1024  # Disconnect once this much is spooled
+
+#Input flow control, per client
+INPUT_QUEUE_LIMIT = 50  # Lines that may wait to be interpreted, the rest are dropped
+COMMANDS_PER_PULSE = 1  # Sustained command rate, ROM ran one a pulse
+COMMAND_BURST = 4  # Commands that may be saved up and run back to back
+
+#Pulse catch up, when the game loop falls behind
+PULSE_CATCHUP_MAX = 4  # Most pulses run back to back, 0 for no limit
+PULSE_CATCHUP_POLICY = 'coalesce'  # Past that, 'skip' the rest or 'coalesce' them into one
+
+#Areas without players
+AREA_HIBERNATE_TICKS = 3  # Empty ticks before an area stops updating until a player returns, 0 never
+
+#Hotfix, watching the source for changes to reload
+HOTFIX_USE_INOTIFY = True  # On Linux, otherwise a thread stats every file
+HOTFIX_POLL_INTERVAL = 3  # Seconds between stats when polling
+
+#Containment, where things are
+CONTAINMENT_CHECKS = False  # Check every cached in_room/in_area/in_living/in_item against a full walk
 
 #Files
 AREA_LIST = 'area.lst'
@@ -0,0 +1,208 @@
+"""
+Headless fixed-step simulation of the game world.
+
+Boots the world as the server does, optionally logs in a crowd of scripted
+players with no connection behind them, then runs game pulses back to back
+as fast as they will go.  Random numbers are seeded, so two runs with the
+same arguments on the same tree do the same things, which makes it a bench
+for resets, mobile AI, combat and decay rather than for the network.  At
+the end it reports pulses a second, the cost of each update phase and how
+many memory blocks each phase left allocated.
+
+    python3 simulate.py --pulses 2000 --players 200 --script explorer
+    python3 simulate.py --ticks 50 --seed 7 --tracemalloc 10
+
+Nothing is saved; the players exist only for the run.
+"""
+import argparse
+import gc
+import logging
+import random
+import time
+import tracemalloc
+
+
+def boot_log(self, message, *args, **kws):
+    if self.level <= 21:
+        self._log(21, message, args, **kws)
+
+
+def trace_log(self, message, *args, **kws):
+    if self.level <= 5:
+        self._log(5, message, args, **kws)
+
+
+logging.addLevelName(21, 'BOOT')
+logging.Logger.boot = boot_log
+logging.addLevelName(5, 'TRACE')
+logging.Logger.trace = trace_log
+logger = logging.getLogger()
+
+import merc
+import const
+import db
+import handler_pc
+import hotfix
+import instance
+import bot_scripts
+import update
+
+
+class Stats:
+    def __init__(self):
+        self.commands = 0
+        self.errors = {}  # Command word: count
+        self.collections = [0, 0, 0]
+
+    def error(self, command):
+        word = command.split()[0] if command.strip() else command
+        if word not in self.errors:
+            logger.exception('Player command %r failed', command)
+        self.errors[word] = self.errors.get(word, 0) + 1
+
+
+def spawn_player(name):
+    """
+    A level 1 human of a random class, made the way nanny makes one when
+    the player takes the default skill groups, standing in the temple.
+    """
+    ch = handler_pc.Pc(name)
+    race = const.pc_race_table['human']
+    ch.race = const.race_table[race.name]
+    for i in range(merc.MAX_STATS):
+        ch.perm_stat[i] = race.stats[i]
+    ch.affected_by.set_bit(ch.race.aff)
+    ch.imm_flags.set_bit(ch.race.imm)
+    ch.res_flags.set_bit(ch.race.res)
+    ch.vuln_flags.set_bit(ch.race.vuln)
+    ch.form.set_bit(ch.race.form)
+    ch.parts.set_bit(ch.race.parts)
+    for skill in race.skills:
+        ch.group_add(skill, False)
+    ch.points = race.points
+    ch.size = race.size
+
+    ch.sex = ch.true_sex = random.choice([merc.SEX_MALE, merc.SEX_FEMALE])
+    ch.guild = const.guild_table[random.choice(sorted(const.guild_table))]
+    ch.alignment = random.choice([750, 0, -750])
+    ch.group_add("rom basics", False)
+    ch.group_add(ch.guild.base_group, False)
+    ch.learned['recall'] = 50
+    ch.group_add(ch.guild.default_group, True)
+    weapons = [weapon for weapon in const.weapon_table.values() if weapon.gsn in ch.learned]
+    if weapons:
+        ch.learned[weapons[0].gsn] = 40
+
+    ch.perm_stat[ch.guild.attr_prime] += 3
+    ch.position = merc.POS_STANDING
+    ch.level = 1
+    ch.exp = ch.exp_per_level(ch.points)
+    ch.hit = ch.max_hit
+    ch.mana = ch.max_mana
+    ch.move = ch.max_move
+    ch.train = 3
+    ch.practice = 5
+    ch.title = "the %s" % const.title_table[ch.guild.name][ch.level][ch.sex - 1]
+    if weapons:
+        ch.do_outfit(weapons[0].name)
+    temple = instance.rooms[instance.instances_by_room.first_instance_of(merc.ROOM_VNUM_TEMPLE)]
+    temple.put(ch)
+    return ch
+
+
+def player_pulse(players, args, stats):
+    # Players act between pulses, as input is read before update_handler.
+    for ch in players:
+        if ch.wait > 0 or random.random() >= args.activity:
+            continue
+        command = bot_scripts.scripted_command(bot_scripts.SCRIPTS[args.script])
+        stats.commands += 1
+        try:
+            ch.interpret(command)
+        except Exception:
+            stats.error(command)
+
+
+def report(pulses, elapsed, stats):
+    elapsed = max(0.000001, elapsed)
+    lines = ['Pulses: %d in %.2fs, %.1f/s (%.1fx real time)' % (
+        pulses, elapsed, pulses / elapsed, pulses / elapsed / merc.PULSE_PER_SECOND)]
+    if stats.commands:
+        lines.append('Player commands: %d, %d failed' % (stats.commands, sum(stats.errors.values())))
+        for word, count in sorted(stats.errors.items(), key=lambda error: -error[1]):
+            lines.append('  %-12s %d failed' % (word, count))
+    lines.append('Garbage collections: %s' % ', '.join(
+        'gen%d %d' % (generation, count) for generation, count in enumerate(stats.collections)))
+    lines.append('%-16s %8s %10s %9s %9s %12s %7s' % (
+        'Phase', 'Calls', 'Total', 'Average', 'Worst', 'Net blocks', 'Failed'))
+    for name, timing in update.phase_timing.items():
+        lines.append('%-16s %8d %8.1fms %7.3fms %7.2fms %12d %7d' % (
+            name, timing.calls, timing.total, timing.average, timing.worst, timing.blocks, timing.errors))
+    return '\n'.join(lines)
+
+
+def collections_since(start):
+    return [generation['collections'] - before for generation, before in zip(gc.get_stats(), start)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the game world headless, as fast as it will go.')
+    parser.add_argument('--pulses', type=int, default=merc.PULSE_TICK * 10,
+                        help='pulses to run, default ten ticks')
+    parser.add_argument('--ticks', type=int, default=None, help='run this many ticks instead')
+    parser.add_argument('--players', type=int, default=0, help='scripted players to log in')
+    parser.add_argument('--script', default='explorer', choices=sorted(bot_scripts.SCRIPTS))
+    parser.add_argument('--activity', type=float, default=0.1,
+                        help='chance a player with no command lag acts each pulse')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--interval', type=int, default=0, help='pulses between progress reports')
+    parser.add_argument('--tracemalloc', type=int, default=0, metavar='N',
+                        help='also trace allocations and show the top N sites; slows the run')
+    parser.add_argument('--verbose', action='store_true', help='log the game as the server would')
+    args = parser.parse_args()
+    logging.basicConfig(format='%(levelname)-8s %(module)16s| %(message)s',
+                        level=logging.INFO if args.verbose else logging.WARNING)
+    random.seed(args.seed)
+    pulses = args.ticks * merc.PULSE_TICK if args.ticks is not None else args.pulses
+
+    start = time.perf_counter()
+    db.boot_db()
+    hotfix.init_directory('commands', silent=True)
+    hotfix.init_directory('spells', silent=True)
+    print('Booted in %.1fs' % (time.perf_counter() - start))
+
+    players = [spawn_player(bot_scripts.bot_name('sim', number)) for number in range(args.players)]
+    update.count_allocations = True
+    update.catch_phase_errors = True
+    if args.tracemalloc:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+    stats = Stats()
+    gc_start = [generation['collections'] for generation in gc.get_stats()]
+
+    start = time.perf_counter()
+    done = 0
+    try:
+        while done < pulses:
+            player_pulse(players, args, stats)
+            update.run_pulses()
+            done += 1
+            if args.interval and done % args.interval == 0:
+                stats.collections = collections_since(gc_start)
+                print(report(done, time.perf_counter() - start, stats) + '\n')
+    except KeyboardInterrupt:
+        print('Interrupted after %d pulses' % done)
+    elapsed = time.perf_counter() - start
+    stats.collections = collections_since(gc_start)
+    print(report(done, elapsed, stats))
+
+    if args.tracemalloc:
+        after = tracemalloc.take_snapshot()
+        print('\nTop allocation sites by net size:')
+        for stat in after.compare_to(before, 'lineno')[:args.tracemalloc]:
+            print('  %s' % stat)
+        tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import const
 import handler_game
 import merc
+import name_index
 
 
 def spell_create_water(sn, level, ch, victim, target):
@@ -19,7 +20,7 @@ def spell_create_water(sn, level, ch, victim, target):
         obj.value[2] = LIQ_WATER
         obj.value[1] += water
         if "water" in obj.name.lower():
-            obj.name = "%s water" % obj.name
+            name_index.rename(obj, "%s water" % obj.name)
 
         handler_game.act("$p is filled.", ch, obj, None, merc.TO_CHAR)
 
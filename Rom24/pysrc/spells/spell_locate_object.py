@@ -2,7 +2,9 @@ import random
 import const
 import game_utils
 import handler_magic
+import instance
 import merc
+import name_index
 import state_checks
 
 
@@ -11,7 +13,8 @@ def spell_locate_object(sn, level, ch, victim, target):
     number = 0
     max_found = 200 if ch.is_immortal() else 2 * level
 
-    for item in instance.items.values():
+    for item_id in name_index.items.find(handler_magic.target_name):
+        item = instance.items[item_id]
         if not ch.can_see_item(item) or not game_utils.is_name(handler_magic.target_name, item.name) \
                 or item.flags.no_locate or random.randint(1, 99) > 2 * level \
                 or ch.level < item.level:
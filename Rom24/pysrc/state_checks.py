@@ -154,12 +154,21 @@ def IS_OUTSIDE(ch):
     return not IS_SET(ch.in_room.room_flags, merc.ROOM_INDOORS)
 
 
+# instance_ids of characters with wait or daze left to count down.  Only
+# these get looked at each pulse.
+lagged_characters = set()
+
+
 def WAIT_STATE(ch, npulse):
     ch.wait = max(ch.wait, npulse)
+    if ch.wait > 0:
+        lagged_characters.add(ch.instance_id)
 
 
 def DAZE_STATE(ch, npulse):
     ch.daze = max(ch.daze, npulse)
+    if ch.daze > 0:
+        lagged_characters.add(ch.instance_id)
 
 
 def get_carry_weight(ch):
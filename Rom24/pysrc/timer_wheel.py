@@ -0,0 +1,194 @@
+"""
+/***************************************************************************
+ *  Original Diku Mud copyright (C) 1990, 1991 by Sebastian Hammer,        *
+ *  Michael Seifert, Hans Henrik St{rfeldt, Tom Madsen, and Katja Nyboe.   *
+ *                                                                         *
+ *  Merc Diku Mud improvments copyright (C) 1992, 1993 by Michael          *
+ *  Chastain, Michael Quan, and Mitchell Tse.                              *
+ *                                                                         *
+ *  In order to use any part of this Merc Diku Mud, you must comply with   *
+ *  both the original Diku license in 'license.doc' as well the Merc       *
+ *  license in 'license.txt'.  In particular, you may not remove either of *
+ *  these copyright notices.                                               *
+ *                                                                         *
+ *  Much time and thought has gone into this software and you are          *
+ *  benefitting.  We hope that you share your changes too.  What goes      *
+ *  around, comes around.                                                  *
+ ***************************************************************************/
+
+/***************************************************************************
+*   ROM 2.4 is copyright 1993-1998 Russ Taylor                             *
+*   ROM has been brought to you by the ROM consortium                      *
+*       Russ Taylor (rtaylor@hypercube.org)                                *
+*       Gabrielle Taylor (gtaylor@hypercube.org)                           *
+*       Brian Moore (zump@rom.org)                                         *
+*   By using this code, you have agreed to follow the terms of the         *
+*   ROM license, in the file Rom24/doc/rom.license                         *
+***************************************************************************/
+/************
+ * Ported to Python by Davion of MudBytes.net
+ * Using Miniboa https://code.google.com/p/miniboa/
+ * Now using Python 3 version https://code.google.com/p/miniboa-py3/
+ ************/
+"""
+import logging
+
+logger = logging.getLogger()
+
+# A hierarchical timer wheel, counting in pulses.
+#
+# Anything that needs to happen later, or every so often, schedules a
+# callback here rather than keeping a countdown and checking it every pulse.
+# update_handler advances the wheel once a pulse, and only the callbacks
+# that are due get looked at.
+#
+# The first level has a slot for each of the next 256 pulses.  Each higher
+# level has 64 slots, each covering a whole turn of the level below; when
+# the level below wraps around, the next slot up is emptied down into it.
+# Adding or cancelling a timer costs the same however many are scheduled.
+LEVEL_BITS = [8, 6, 6, 6]
+MAX_DELAY = (1 << sum(LEVEL_BITS)) - 1  # A little over 194 days
+
+
+class Timer:
+    """
+    The handle for a scheduled callback.  Keep it to cancel the callback.
+    """
+    __slots__ = ['wheel', 'when', 'interval', 'callback', 'args', 'sequence', 'cancelled']
+
+    def __init__(self, wheel, when, interval, callback, args, sequence):
+        self.wheel = wheel
+        self.when = when  # The pulse it is due
+        self.interval = interval  # Pulses between repeats, or None
+        self.callback = callback
+        self.args = args
+        self.sequence = sequence  # Timers due on the same pulse run in the order they were made
+        self.cancelled = False
+
+    @property
+    def active(self):
+        return not self.cancelled
+
+    @property
+    def remaining(self):
+        """
+        Pulses until it next runs.
+        """
+        return max(0, self.when - self.wheel.pulse)
+
+    def cancel(self):
+        """
+        Stop the callback from running again.  Safe to call more than once,
+        or from inside the callback itself.
+        """
+        if not self.cancelled:
+            self.cancelled = True
+            self.wheel.count -= 1
+
+
+class TimerWheel:
+    def __init__(self):
+        self.pulse = 0  # The last pulse run
+        self.count = 0  # Timers still to run
+        self.sequence = 0
+        self.levels = [[[] for i in range(1 << bits)] for bits in LEVEL_BITS]
+        self.shifts = [sum(LEVEL_BITS[:level]) for level in range(len(LEVEL_BITS))]
+
+    def schedule(self, delay, callback, *args):
+        """
+        Run callback(*args) once, delay pulses from now.  A delay of 0 or
+        less means next pulse.
+        """
+        return self._new_timer(delay, None, callback, args)
+
+    def schedule_repeating(self, interval, callback, *args, delay=None):
+        """
+        Run callback(*args) every interval pulses, starting delay pulses
+        from now (interval, if delay is None).
+        """
+        if interval < 1:
+            raise ValueError("Repeating timers need an interval of at least one pulse.")
+        interval = min(interval, MAX_DELAY)
+        return self._new_timer(interval if delay is None else delay, interval, callback, args)
+
+    def _new_timer(self, delay, interval, callback, args):
+        self.sequence += 1
+        self.count += 1
+        timer = Timer(self, self.pulse + max(1, min(delay, MAX_DELAY)), interval, callback, args, self.sequence)
+        self._insert(timer)
+        return timer
+
+    def _insert(self, timer):
+        delay = timer.when - self.pulse
+        for level, bits in enumerate(LEVEL_BITS):
+            if delay < 1 << (self.shifts[level] + bits):
+                break
+        slots = self.levels[level]
+        slots[(max(timer.when, self.pulse) >> self.shifts[level]) & (len(slots) - 1)].append(timer)
+
+    def _cascade(self, level):
+        """
+        Empty the current slot of a level into the ones below it.
+        """
+        slots = self.levels[level]
+        index = (self.pulse >> self.shifts[level]) & (len(slots) - 1)
+        timers = slots[index]
+        slots[index] = []
+        for timer in timers:
+            if not timer.cancelled:
+                self._insert(timer)
+
+    def advance(self, pulses=1):
+        """
+        Move on and run whatever is due.  Moving on more than one pulse
+        coalesces them: everything due in between runs, but a repeating
+        timer runs only once however many times it came round.
+        """
+        due = []
+        repeated = set()
+        for i in range(pulses):
+            self.pulse += 1
+            level = 1
+            while level < len(LEVEL_BITS) and self.pulse & ((1 << self.shifts[level]) - 1) == 0:
+                self._cascade(level)
+                level += 1
+
+            slots = self.levels[0]
+            index = self.pulse & (len(slots) - 1)
+            if not slots[index]:
+                continue
+            for timer in slots[index]:
+                if timer.cancelled:
+                    continue
+                if timer.interval:
+                    ## Only the first time round counts when coalescing
+                    if timer not in repeated:
+                        repeated.add(timer)
+                        due.append(timer)
+                    timer.when = self.pulse + timer.interval
+                    self._insert(timer)
+                else:
+                    due.append(timer)
+            slots[index] = []
+
+        if len(due) > 1:
+            due.sort(key=lambda timer: timer.sequence)
+        for timer in due:
+            if timer.cancelled:
+                continue
+            if not timer.interval:
+                timer.cancelled = True
+                self.count -= 1
+            timer.callback(*timer.args)
+
+
+# The game's own wheel, advanced once a pulse by update_handler.
+pulse_timers = TimerWheel()
+
+
+def schedule(delay, callback, *args):
+    return pulse_timers.schedule(delay, callback, *args)
+
+
+def schedule_repeating(interval, callback, *args, delay=None):
+    return pulse_timers.schedule_repeating(interval, callback, *args, delay=delay)
@@ -33,6 +33,8 @@
 """
 
 import os
+import sys
+import collections
 import random
 import time
 import logging
@@ -51,6 +53,7 @@ import handler_game
 import handler_ch
 import game_utils
 import instance
+import timer_wheel
 
 
 # Advancement stuff.
@@ -277,13 +280,65 @@ def gain_condition(ch, iCond, value):
                 ch.send("You are sober.\n")
 
 
+# Area hibernation.  An area nobody has been in for a few ticks stops
+# getting npc and char updates.  When a player walks back in
+# it is caught up in one step, rather than tick by tick, so the cost of a
+# tick follows the occupied areas instead of the whole world.
+def awake_people():
+    # Characters are always in a room, so the area's own people are all of them.
+    people = []
+    for area in instance.areas.values():
+        if not area.hibernating:
+            people.extend(area.people)
+    return people
+
+
+def hibernate_update():
+    if not settings.AREA_HIBERNATE_TICKS:
+        return
+    for area in instance.areas.values():
+        if area.player_count:
+            area.idle_ticks = 0
+            continue
+        area.idle_ticks += 1
+        if not area.hibernating and area.idle_ticks >= settings.AREA_HIBERNATE_TICKS:
+            people, items = area.contents()
+            if not any(instance.characters[ch_id].act.is_set(merc.ACT_UPDATE_ALWAYS) for ch_id in people):
+                area.hibernate()
+        if area.hibernating:
+            area.ticks_missed += 1
+
+
+def catch_up_area(area):
+    ticks = area.ticks_missed
+    area.ticks_missed = 0
+    area.idle_ticks = 0
+    if not ticks:
+        return
+    # An empty area resets at age 31, see db.area_update.
+    if area.age >= 31:
+        db.reset_area(area)
+        handler_game.wiznet("%s has just been reset." % area.name, None, None, merc.WIZ_RESETS, 0, 0)
+        area.age = random.randint(0, 3)
+
+    people, items = area.contents()
+    for ch_id in people:
+        ch = instance.characters[ch_id]
+        if not ch.is_npc():
+            continue
+        ch.hit = min(ch.max_hit, ch.hit + max(0, hit_gain(ch)) * ticks)
+        ch.mana = min(ch.max_mana, ch.mana + max(0, mana_gain(ch)) * ticks)
+        ch.move = min(ch.max_move, ch.move + max(0, move_gain(ch)) * ticks)
+
+
 # * Mob autonomous action.
 # * This function takes 25% to 35% of ALL Merc cpu time.
 # * -- Furey
 def npc_update():
-    # Examine all mobs. */
-    for npc in instance.characters.values():
-        if not npc.is_npc() or npc.in_room is None or npc.is_affected(merc.AFF_CHARM):
+    # Examine all mobs in areas that are awake. */
+    for npc_id in awake_people():
+        npc = instance.characters.get(npc_id, None)
+        if not npc or not npc.is_npc() or npc.in_room is None or npc.is_affected(merc.AFF_CHARM):
             continue
 
         if instance.area_templates[npc.in_room.area] and not npc.act.is_set(merc.ACT_UPDATE_ALWAYS):
@@ -420,6 +475,28 @@ def weather_update():
     return
 
 
+# Affects on characters schedule these on the pulse timers, see AFFECT_DATA.
+def affect_expired(owner_id, paf):
+    ch = instance.characters.get(owner_id, None)
+    if ch and paf in ch.affected:
+        timed_phase('affect_update', expire_affect, ch, paf)
+
+
+def expire_affect(ch, paf):
+    # multiple affects. don't send the spelldown msg
+    multi = [a for a in ch.affected if a.type == paf.type and a is not paf and a.duration > 0]
+    if not multi and paf.type and const.skill_table[paf.type].msg_off:
+        ch.send(const.skill_table[paf.type].msg_off + "\n")
+
+    ch.affect_remove(paf)
+
+
+def affect_faded(paf):
+    if paf.level > 0:
+        paf.level -= 1  # spell strength fades with time */
+    paf.schedule_fade()
+
+
 save_number = 0
 #
 # * Update all chars, including mobs.
@@ -431,9 +508,12 @@ def char_update():
     if save_number > 29:
         save_number = 0
     ch_quit = []
-    id_list = [instance_id for instance_id in instance.characters.keys()]
-    for character_id in id_list:
-        ch = instance.characters[character_id]
+    id_list = [ch_id for ch_id in awake_people() if instance.characters[ch_id].is_npc()]
+    id_list += [instance_id for instance_id in instance.players.keys()]
+    for character_id in id_list[:]:
+        ch = instance.characters.get(character_id, None)
+        if not ch:
+            continue
         if ch.timer > 30:
             ch_quit.append(ch)
 
@@ -489,7 +569,7 @@ def char_update():
                     ch.send("You disappear into the void.\n")
                     if ch.level > 1:
                         ch.save()
-                    limbo_id = instance.instances_by_room[merc.ROOM_VNUM_LIMBO][0]
+                    limbo_id = instance.instances_by_room.first_instance_of(merc.ROOM_VNUM_LIMBO)
                     limbo = instance.rooms[limbo_id]
                     ch.in_room.get(ch)
                     limbo.put(ch)
@@ -499,25 +579,11 @@ def char_update():
             gain_condition(ch, merc.COND_THIRST, -1)
             gain_condition(ch, merc.COND_HUNGER, -2 if ch.size > merc.SIZE_MEDIUM else -1)
 
-        for paf in ch.affected[:]:
-            if paf.duration > 0:
-                paf.duration -= 1
-                if random.randint(0, 4) == 0 and paf.level > 0:
-                    paf.level -= 1  # spell strength fades with time */
-            elif paf.duration < 0:
-                pass
-            else:
-                # multiple affects. don't send the spelldown msg
-                multi = [a for a in ch.affected if a.type == paf.type and a is not paf and a.duration > 0]
-                if not multi and paf.type and const.skill_table[paf.type].msg_off:
-                    ch.send(const.skill_table[paf.type].msg_off + "\n")
-
-                ch.affect_remove(paf)
-                #
-                # * Careful with the damages here,
-                # *   MUST NOT refer to ch after damage taken,
-                # *   as it may be lethal damage (on NPC).
-                # */
+        #
+        # * Careful with the damages here,
+        # *   MUST NOT refer to ch after damage taken,
+        # *   as it may be lethal damage (on NPC).
+        # */
 
         if state_checks.is_affected(ch, 'plague') and ch:
             if ch.in_room is None:
@@ -578,89 +644,101 @@ def char_update():
 
 
 def item_update():
-    for item in instance.items.values():
-        # go through affects and decrement */
-        if item:
-            for paf in item.affected[:]:
-                if paf.duration > 0:
-                    paf.duration -= 1
-                    if random.randint(0, 4) == 0 and paf.level > 0:
-                        paf.level -= 1  # spell strength fades with time */
-                elif paf.duration < 0:
-                    pass
-                else:
-                    multi = [a for a in item.affected if a.type == paf.type and a is not paf and a.duration > 0]
-                    if multi and paf.type > 0 and const.skill_table[paf.type].msg_obj:
-                        if item.in_living:
-                            rch = instance.characters[item.in_living]
-                            handler_game.act(const.skill_table[paf.type].msg_obj, rch, item, None, merc.TO_CHAR)
-
-                        if item.in_room is not None and item.in_room.people[:]:
-                            handler_game.act(const.skill_table[paf.type].msg_obj,
-                                             item.in_room.people, item, None, merc.TO_ALL)
-                    item.affect_remove(paf)
-            item.timer -= 1
-            if item.timer <= 0 or item.timer > 0:
-                continue
+    # go through affects and decrement */
+    for item_id in list(instance.timed_affect_items):
+        item = instance.items.get(item_id, None)
+        if not item:
+            instance.timed_affect_items.discard(item_id)
+            continue
+        for paf in item.affected[:]:
+            if paf.duration > 0:
+                paf.duration -= 1
+                if random.randint(0, 4) == 0 and paf.level > 0:
+                    paf.level -= 1  # spell strength fades with time */
+            elif paf.duration < 0:
+                pass
+            else:
+                multi = [a for a in item.affected if a.type == paf.type and a is not paf and a.duration > 0]
+                if multi and paf.type and const.skill_table[paf.type].msg_obj:
+                    if item.in_living:
+                        handler_game.act(const.skill_table[paf.type].msg_obj, item.in_living, item, None, merc.TO_CHAR)
+                    elif item.in_room is not None and item.in_room.people:
+                        rch = instance.characters[item.in_room.people[0]]
+                        handler_game.act(const.skill_table[paf.type].msg_obj, rch, item, None, merc.TO_ALL)
+                item.affect_remove(paf)
+        if not [paf for paf in item.affected if paf.duration >= 0]:
+            instance.timed_affect_items.discard(item_id)
+    return
 
-            if item.item_type == merc.ITEM_FOUNTAIN:
-                message = "$p dries up."
-            elif item.item_type == merc.ITEM_CORPSE_NPC:
-                message = "$p decays into dust."
-            elif item.item_type == merc.ITEM_CORPSE_PC:
-                message = "$p decays into dust."
-            elif item.item_type == merc.ITEM_FOOD:
-                message = "$p decomposes."
-            elif item.item_type == merc.ITEM_POTION:
-                message = "$p has evaporated from disuse."
-            elif item.item_type == merc.ITEM_PORTAL:
-                message = "$p fades out of existence."
-            elif item.item_type == merc.ITEM_CONTAINER:
-                if item.flags.float:
-                    if item.inventory:
-                        message = "$p flickers and vanishes, spilling its contents on the floor."
-                    else:
-                        message = "$p flickers and vanishes."
-                else:
-                    message = "$p crumbles into dust."
+
+# An item's timer has run out.  Items schedule this on the pulse timers when
+# their timer is set, due on the tick it gets to zero.
+def decay_due(item_id):
+    item = instance.items.get(item_id, None)
+    if item:
+        timed_phase('item_decay', item_decay, item)
+
+
+def item_decay(item):
+    if item.item_type == merc.ITEM_FOUNTAIN:
+        message = "$p dries up."
+    elif item.item_type == merc.ITEM_CORPSE_NPC:
+        message = "$p decays into dust."
+    elif item.item_type == merc.ITEM_CORPSE_PC:
+        message = "$p decays into dust."
+    elif item.item_type == merc.ITEM_FOOD:
+        message = "$p decomposes."
+    elif item.item_type == merc.ITEM_POTION:
+        message = "$p has evaporated from disuse."
+    elif item.item_type == merc.ITEM_PORTAL:
+        message = "$p fades out of existence."
+    elif item.item_type == merc.ITEM_CONTAINER:
+        if item.flags.float:
+            if item.inventory:
+                message = "$p flickers and vanishes, spilling its contents on the floor."
             else:
-                message = "$p crumbles into dust."
+                message = "$p flickers and vanishes."
+        else:
+            message = "$p crumbles into dust."
+    else:
+        message = "$p crumbles into dust."
 
-            if item.in_living:
-                if state_checks.IS_NPC(instance.characters[item.in_living]) and instance.characters[item.in_living].pShop:
-                    instance.characters[item.in_living].silver += item.cost // 5
-                else:
-                    handler_game.act(message, instance.characters[item.in_living], item, None, merc.TO_CHAR)
-                    if 'float' in item.equipped_to:
-                        handler_game.act(message, instance.characters[item.in_living], item, None, merc.TO_ROOM)
-            elif item.in_room and item.in_room.people[:]:
-                if not (item.in_item and instance.items[item.in_item].vnum == merc.OBJ_VNUM_PIT
-                        and not item.take):
-                    handler_game.act(message, item.in_room.people[:1], item, None, merc.TO_ROOM)
-                    handler_game.act(message, item.in_room.people[:1], item, None, merc.TO_CHAR)
-
-            if (item.item_type == merc.ITEM_CORPSE_PC or 'float' in item.equipped_to) and item.inventory:
-                # save the contents */
-                for t_item_id in item.inventory[:]:
-                    t_item = instance.items[t_item_id]
-                    t_item.get()
-
-                    if item.in_item:  # in another object */
-                        t_item.put(item.in_item)
-                    elif item.in_living:  # carried */
-                        if 'float' in item.equipped_to:
-                            if item.in_living.in_room is None:
-                                t_item.extract()
-                            else:
-                                t_item.put(item.in_living.in_room)
-                        else:
-                            t_item.put(item.in_living)
-                    elif not item.in_room:  # destroy it */
+    carrier = item.in_living
+    floating = item.equipped_to == 'float'
+    if carrier:
+        if carrier.is_npc() and carrier.pShop:
+            carrier.silver += item.cost // 5
+        else:
+            handler_game.act(message, carrier, item, None, merc.TO_CHAR)
+            if floating:
+                handler_game.act(message, carrier, item, None, merc.TO_ROOM)
+    elif item.in_room and item.in_room.people:
+        if not (item.in_item and item.in_item.vnum == merc.OBJ_VNUM_PIT and not item.in_item.flags.take):
+            rch = instance.characters[item.in_room.people[0]]
+            handler_game.act(message, rch, item, None, merc.TO_ROOM)
+            handler_game.act(message, rch, item, None, merc.TO_CHAR)
+
+    if (item.item_type == merc.ITEM_CORPSE_PC or floating) and item.inventory:
+        # save the contents */
+        for t_item_id in item.inventory[:]:
+            t_item = instance.items[t_item_id]
+            item.get(t_item)
+
+            if item.in_item:  # in another object */
+                item.in_item.put(t_item)
+            elif carrier:  # carried */
+                if floating:
+                    if carrier.in_room is None:
                         t_item.extract()
-                    else:  # to a room */
-                        t_item.put(item.in_room)
-            item.extract()
-    return
+                    else:
+                        carrier.in_room.put(t_item)
+                else:
+                    carrier.put(t_item)
+            elif not item.in_room:  # destroy it */
+                t_item.extract()
+            else:  # to a room */
+                item.in_room.put(t_item)
+    item.extract()
 
 
 #
@@ -676,50 +754,62 @@ def item_update():
 # *   who leads the party into the room.
 # *
 # * -- Furey
+# *
+# * Only rooms in instance.pending_aggression are looked at: those a
+# *   PC or an aggressive mob has entered, for as long as they hold both.
+# *   The rest of the checks, and the coin flip, still happen every pulse.
 # */
 def aggr_update():
-    for wch in instance.characters.values():
-        if wch.is_npc() \
-                or wch.level >= merc.LEVEL_IMMORTAL \
-                or wch.in_room is None \
-                or wch.in_area.empty:
+    for room_id in list(instance.pending_aggression):
+        room = instance.rooms.get(room_id, None)
+        people = [instance.characters[ch_id] for ch_id in room.people] if room else []
+        if not any(not ch.is_npc() for ch in people) \
+                or not any(ch.is_npc() and ch.act.is_set(merc.ACT_AGGRESSIVE) for ch in people):
+            instance.pending_aggression.discard(room_id)
             continue
 
-        for ch_id in wch.in_room.people[:]:
-            ch = instance.characters[ch_id]
-            if not ch.is_npc() \
-                    or not ch.act.is_set(merc.ACT_AGGRESSIVE) \
-                    or state_checks.IS_SET(ch.in_room.room_flags, merc.ROOM_SAFE) \
-                    or ch.is_affected(merc.AFF_CALM) \
-                    or ch.fighting is not None \
-                    or ch.is_affected(merc.AFF_CHARM) \
-                    or not ch.is_awake() \
-                    or (ch.act.is_set(merc.ACT_WIMPY) and wch.is_awake()) \
-                    or not ch.can_see(wch) \
-                    or random.randint(0, 1) == 0:
+        for wch in people:
+            if wch.is_npc() \
+                    or wch.level >= merc.LEVEL_IMMORTAL \
+                    or wch.in_room is not room \
+                    or wch.in_area.empty:
                 continue
 
-            #
-            # * Ok we have a 'wch' player character and a 'ch' npc aggressor.
-            # * Now make the aggressor fight a RANDOM pc victim in the room,
-            # *   giving each 'vch' an equal chance of selection.
-            count = 0
-            victim = None
-            for vch_id in wch.in_room.people[:]:
-                vch = instance.characters[vch_id]
-                if not vch.is_npc() \
-                        and vch.level < merc.LEVEL_IMMORTAL \
-                        and ch.level >= vch.level - 5 \
-                        and (not ch.act.is_set(merc.ACT_WIMPY) or not vch.is_awake()) \
-                        and ch.can_see(vch):
-                    if random.randint(0, count) == 0:
-                        victim = vch
-                    count += 1
-
-            if not victim:
-                continue
+            for ch_id in wch.in_room.people[:]:
+                ch = instance.characters[ch_id]
+                if not ch.is_npc() \
+                        or not ch.act.is_set(merc.ACT_AGGRESSIVE) \
+                        or state_checks.IS_SET(ch.in_room.room_flags, merc.ROOM_SAFE) \
+                        or ch.is_affected(merc.AFF_CALM) \
+                        or ch.fighting is not None \
+                        or ch.is_affected(merc.AFF_CHARM) \
+                        or not ch.is_awake() \
+                        or (ch.act.is_set(merc.ACT_WIMPY) and wch.is_awake()) \
+                        or not ch.can_see(wch) \
+                        or random.randint(0, 1) == 0:
+                    continue
 
-            fight.multi_hit(ch, victim, merc.TYPE_UNDEFINED)
+                #
+                # * Ok we have a 'wch' player character and a 'ch' npc aggressor.
+                # * Now make the aggressor fight a RANDOM pc victim in the room,
+                # *   giving each 'vch' an equal chance of selection.
+                count = 0
+                victim = None
+                for vch_id in wch.in_room.people[:]:
+                    vch = instance.characters[vch_id]
+                    if not vch.is_npc() \
+                            and vch.level < merc.LEVEL_IMMORTAL \
+                            and ch.level >= vch.level - 5 \
+                            and (not ch.act.is_set(merc.ACT_WIMPY) or not vch.is_awake()) \
+                            and ch.can_see(vch):
+                        if random.randint(0, count) == 0:
+                            victim = vch
+                        count += 1
+
+                if not victim:
+                    continue
+
+                fight.multi_hit(ch, victim, merc.TYPE_UNDEFINED)
 
 
 def instance_number_save():
@@ -731,62 +821,152 @@ def instance_number_save():
         fp.close()
         logger.info("Saved the current instance number: %d" % (instance.max_instance_id,))
 
+
+# Pulse budget accounting.  Each phase of the update keeps its own timings,
+# and pulse_lag holds how late each of the last few hundred updates started.
+class PhaseTiming:
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0  # Milliseconds
+        self.worst = 0.0
+        self.recent = 0.0  # Moving average, weighted towards the last few calls
+        self.blocks = 0  # Net memory blocks left allocated, when count_allocations is on
+        self.errors = 0  # Exceptions caught, when catch_phase_errors is on
+
+    def add(self, elapsed, blocks=0):
+        self.calls += 1
+        self.total += elapsed
+        self.blocks += blocks
+        self.worst = max(self.worst, elapsed)
+        self.recent = elapsed if self.calls == 1 else self.recent * 0.9 + elapsed * 0.1
+
+    @property
+    def average(self):
+        return self.total / self.calls if self.calls else 0.0
+
+
+phase_timing = collections.OrderedDict()
+# Set by the simulator; costs a couple of calls per phase so is off in play.
+count_allocations = False
+# Also set by the simulator, so a bug in one phase is counted and the run goes on.
+catch_phase_errors = False
+pulse_lag = collections.deque(maxlen=merc.PULSE_PER_SECOND * 60)
+pulses_skipped = 0
+pulses_coalesced = 0
+
+
+def timed_phase(name, func, *args):
+    blocks = sys.getallocatedblocks() if count_allocations else 0
+    start = time.perf_counter()
+    if name not in phase_timing:
+        phase_timing[name] = PhaseTiming()
+    timing = phase_timing[name]
+    try:
+        return func(*args)
+    except Exception:
+        if not catch_phase_errors:
+            raise
+        if not timing.errors:
+            logger.exception('Update phase %s failed', name)
+        timing.errors += 1
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        if count_allocations:
+            blocks = sys.getallocatedblocks() - blocks
+        timing.add(elapsed, blocks)
+
+
+def area_pulse():
+    timed_phase('area_update', db.area_update)
+    instance_number_save()  # Piggyback on area updates to save the instance number.
+
+
+def npc_pulse():
+    timed_phase('npc_update', npc_update)
+
+
+def violence_pulse():
+    timed_phase('poll_files', hotfix.poll_files)
+    timed_phase('violence_update', fight.violence_update)
+
+
+def point_pulse():
+    handler_game.wiznet("TICK!", None, None, merc.WIZ_TICKS, 0, 0)
+    # weather_update  ( )
+    timed_phase('hibernate_update', hibernate_update)
+    timed_phase('char_update', char_update)
+    timed_phase('item_update', item_update)
+
+
+def aggr_pulse():
+    timed_phase('aggr_update', aggr_update)
+
+
+# Everything runs on the first pulse, then every so often after that.
+# Timers due on the same pulse run in the order they were scheduled here.
+area_timer = timer_wheel.schedule_repeating(merc.PULSE_AREA, area_pulse, delay=1)
+npc_timer = timer_wheel.schedule_repeating(merc.PULSE_MOBILE, npc_pulse, delay=1)
+violence_timer = timer_wheel.schedule_repeating(merc.PULSE_VIOLENCE, violence_pulse, delay=1)
+point_timer = timer_wheel.schedule_repeating(merc.PULSE_TICK, point_pulse, delay=1)
+aggr_timer = timer_wheel.schedule_repeating(1, aggr_pulse)
+
+
+def lag_update(pulses):
+    for instance_id in list(state_checks.lagged_characters):
+        ch = instance.characters.get(instance_id, None)
+        if ch:
+            ch.daze = max(0, ch.daze - pulses)
+            ch.wait = max(0, ch.wait - pulses)
+        if not ch or (ch.daze <= 0 and ch.wait <= 0):
+            state_checks.lagged_characters.discard(instance_id)
+
+
+def run_pulses(pulses=1):
+    timed_phase('lag_update', lag_update, pulses)
+    timer_wheel.pulse_timers.advance(pulses)
+
+
 #
 # * Handle all kinds of updates.
 # * Called once per pulse from game loop.
 # * Random times to defeat tick-timing clients and players.
 # */
 previous_pulse = -1
-pulse_area = 0
-pulse_npc = 0
-pulse_violence = 0
-pulse_point = 0
 
 
 def update_handler():
     global previous_pulse
-    global pulse_area
-    global pulse_npc
-    global pulse_violence
-    global pulse_point
+    global pulses_skipped
+    global pulses_coalesced
 
     current_time = get_precise_time()
     if previous_pulse == -1:
         previous_pulse = current_time-1
 
-    while current_time >= previous_pulse + merc.MILLISECONDS_PER_PULSE:
-        previous_pulse += merc.MILLISECONDS_PER_PULSE
-
-        pulse_area -= 1
-        pulse_npc -= 1
-        pulse_violence -= 1
-        pulse_point -= 1
-
-        for ch in instance.characters.values():
-            if ch.daze > 0:
-                ch.daze -= 1
-            if ch.wait > 0:
-                ch.wait -= 1
-
-        if pulse_area <= 0:
-            pulse_area = merc.PULSE_AREA
-            db.area_update()
-            instance_number_save()  # Piggyback on area updates to save the instance number.
-
-        if pulse_npc <= 0:
-            pulse_npc = merc.PULSE_MOBILE
-            npc_update()
-        if pulse_violence <= 0:
-            hotfix.poll_files()
-            pulse_violence = merc.PULSE_VIOLENCE
-            fight.violence_update()
-        if pulse_point <= 0:
-            handler_game.wiznet("TICK!", None, None, merc.WIZ_TICKS, 0, 0)
-            pulse_point = merc.PULSE_TICK
-            # weather_update  ( )
-            char_update()
-            item_update()
-        aggr_update()
+    due = int((current_time - previous_pulse) // merc.MILLISECONDS_PER_PULSE)
+    if due <= 0:
+        return
+    pulse_lag.append(current_time - previous_pulse - merc.MILLISECONDS_PER_PULSE)
+    previous_pulse += due * merc.MILLISECONDS_PER_PULSE
+
+    # Don't let one slow pulse turn into a death spiral of catching up.
+    limit = settings.PULSE_CATCHUP_MAX
+    if not limit or due <= limit:
+        for i in range(due):
+            run_pulses()
+        return
+
+    behind = due - limit
+    logger.warning("Game loop is %d pulses behind, %s %d of them",
+                   due, 'coalescing' if settings.PULSE_CATCHUP_POLICY == 'coalesce' else 'skipping', behind)
+    for i in range(limit - 1):
+        run_pulses()
+    if settings.PULSE_CATCHUP_POLICY == 'coalesce':
+        pulses_coalesced += behind
+        run_pulses(behind + 1)
+    else:
+        pulses_skipped += behind
+        run_pulses()
 
 
 def get_precise_time():
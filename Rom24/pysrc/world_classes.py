@@ -13,6 +13,8 @@ import instance
 import settings
 import type_bypass
 import bit
+import timer_wheel
+import update
 
 __author__ = 'syn'
 
@@ -41,6 +43,13 @@ class Area(instance.Instancer, type_bypass.ObjectType, environment.Environment):
         #As in, this area is just loaded and has no PC objects, True
         self.empty = False
         self.player_chars = []
+        #Ids of the characters and items lying in the area's rooms, kept by Room.put and Room.get
+        self.people = set()
+        self.items = set()
+        #Hibernating areas get no npc or char updates until a player comes back, see update.py
+        self.hibernating = False
+        self.idle_ticks = 0
+        self.ticks_missed = 0
         if kwargs:
             [setattr(self, k, copy.deepcopy(v)) for k, v in kwargs.items()]
         if template:
@@ -86,6 +95,7 @@ class Area(instance.Instancer, type_bypass.ObjectType, environment.Environment):
     def add_pc(self, player_char):
         if player_char.is_living and not player_char.is_npc():
             if not player_char.instance_id in self.player_chars:
+                self.wake()
                 #Transition an empty area, to an occupied one, for Resets
                 if self.empty:
                     self.empty = False
@@ -105,6 +115,45 @@ class Area(instance.Instancer, type_bypass.ObjectType, environment.Environment):
         else:
             raise KeyError('Entity not a player character, or is an NPC on area removal! %r' % type(player_char))
 
+    def occupy(self, thing):
+        if thing.is_living:
+            self.people.add(thing.instance_id)
+        elif thing.is_item:
+            self.items.add(thing.instance_id)
+
+    def vacate(self, thing):
+        self.people.discard(thing.instance_id)
+        self.items.discard(thing.instance_id)
+
+    def contents(self):
+        # Everyone in the area, and every item in it, carried or worn, however deeply nested.
+        people = []
+        items = []
+        contents = list(self.people)
+        contents.extend(self.items)
+        for thing_id in contents:
+            if thing_id in instance.characters:
+                ch = instance.characters[thing_id]
+                people.append(thing_id)
+                contents.extend(ch.inventory)
+                contents.extend(item_id for item_id in ch.equipped.values() if item_id)
+            elif thing_id in instance.items:
+                items.append(thing_id)
+                contents.extend(instance.items[thing_id].inventory)
+        return people, items
+
+    def hibernate(self):
+        self.hibernating = True
+        self.ticks_missed = 0
+
+    def wake(self):
+        # Catching up can reset the area, so it is left to the next pulse
+        # rather than done in the middle of whoever is walking in.
+        if not self.hibernating:
+            return
+        self.hibernating = False
+        timer_wheel.schedule(0, update.catch_up_area, self)
+
     def instance_setup(self):
         instance.global_instances[self.instance_id] = self
         instance.areas[self.instance_id] = self
@@ -114,6 +163,7 @@ class Area(instance.Instancer, type_bypass.ObjectType, environment.Environment):
             instance.instances_by_area[self.name] += [self.instance_id]
 
     def instance_destructor(self):
+        self.forget_containment()
         instance.instances_by_area[self.name].remove(self.instance_id)
         del instance.areas[self.instance_id]
         del instance.global_instances[self.instance_id]
@@ -126,7 +176,7 @@ class Area(instance.Instancer, type_bypass.ObjectType, environment.Environment):
         for k, v in self.__dict__.items():
             if str(type(v)) in ("<class 'function'>", "<class 'method'>"):
                 continue
-            elif str(k) in ('_last_saved', '_md5'):
+            elif str(k) in ('_last_saved', '_md5', 'hibernating', 'idle_ticks', 'ticks_missed', 'people', 'items'):
                 continue
             else:
                 tmp_dict[k] = v
@@ -248,7 +298,7 @@ class Exit:
             import copy
             [setattr(self, k, copy.deepcopy(v)) for k, v in template.__dict__.items()]
             if self.to_room_vnum != -1 and not None and self.to_room_vnum in instance.instances_by_room:
-                self.to_room = instance.instances_by_room[self.to_room_vnum][0]
+                self.to_room = instance.instances_by_room.first_instance_of(self.to_room_vnum)
             elif self.to_room_vnum not in instance.instances_by_room:
                 self.is_broken = True
                 logger.error("Exit(): bad to_room_vnum %d.", self.to_room_vnum)
@@ -302,7 +352,7 @@ class Reset:
         self.arg4 = 0
         if template:
             [setattr(self, k, copy.deepcopy(v)) for k, v in template.__dict__.items()]
-            self.room = instance.instances_by_room[self.room][0]
+            self.room = instance.instances_by_room.first_instance_of(self.room)
         if kwargs:
             [setattr(self, k, copy.deepcopy(v)) for k, v in kwargs.items()]
 